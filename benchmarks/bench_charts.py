@@ -0,0 +1,68 @@
+from io import StringIO
+
+import pandas as pd
+import pytest
+from plotly import express as px
+
+from benchmarks.synthetic import Scale, generate_scalar_data
+from benchmarks.utils import get_graph_filter_set
+from django_comparison_dashboard import graphs, settings
+
+ROWS = (10_000, 100_000, 500_000)
+RECORDS_CHARTS = {"bar": px.bar, "line": px.line}
+
+
+def get_chart_data(rows: int) -> pd.DataFrame:
+    """Return synthetic data with approximately given rows, array columns are joined as done in preprocessing"""
+    default_scale = Scale()
+    scale = Scale(processes=rows // (default_scale.rows // default_scale.processes))
+    data = generate_scalar_data(scale)
+    for column in ("groups", "input_groups", "output_groups"):
+        data[column] = data[column].str.join(settings.ARRAY_JOINER)
+    return data
+
+
+@pytest.fixture(scope="module", params=ROWS, ids=lambda rows: f"{rows}_rows")
+def chart_data(request):
+    return get_chart_data(request.param)
+
+
+@pytest.mark.parametrize("chart_type", graphs.CHART_DATA.keys())
+def bench_chart(benchmark, chart_data, chart_type):
+    """Build figure using chart function"""
+    chart_function = graphs.CHART_DATA[chart_type]["chart_function"]
+    if chart_type == "sankey":
+        # Sankey charts are built from flows between nodes
+        chart_data = chart_data.groupby(["process", "input_groups", "output_groups", "unit"], as_index=False)[
+            "value"
+        ].sum()
+
+    benchmark.group = f"chart-{chart_type}-{len(chart_data)}"
+    # Graph filter sets are rebuilt for every round, as display options are consumed while adapting the figure
+    benchmark.pedantic(chart_function, setup=lambda: ((chart_data, get_graph_filter_set(chart_type)), {}), rounds=3)
+
+
+@pytest.mark.parametrize("chart_type", RECORDS_CHARTS.keys())
+def bench_chart_from_records(benchmark, chart_data, chart_type):
+    """Reference: build figure the former way by converting data into records for plotly express first"""
+
+    def chart_from_records(data, filter_set):
+        fig = RECORDS_CHARTS[chart_type](data.to_dict(orient="records"), **filter_set.plot_options)
+        return graphs.adapt_plot_figure(fig, filter_set, data)
+
+    benchmark.group = f"chart-{chart_type}-{len(chart_data)}"
+    benchmark.pedantic(
+        chart_from_records, setup=lambda: ((chart_data, get_graph_filter_set(chart_type)), {}), rounds=3
+    )
+
+
+def bench_csv_export(benchmark, chart_data):
+    """Export data as CSV as done in data download"""
+
+    def export(data):
+        csv_buffer = StringIO()
+        data.to_csv(csv_buffer, index=False)
+        return csv_buffer.getvalue()
+
+    benchmark.group = f"export-{len(chart_data)}"
+    benchmark(export, chart_data)
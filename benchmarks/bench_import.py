@@ -0,0 +1,25 @@
+import pytest
+
+from benchmarks.synthetic import write_csv
+from django_comparison_dashboard import models, settings
+from django_comparison_dashboard.sources.csv import CSVScenario
+
+
+@pytest.fixture()
+def csv_path(tmp_path, scalar_data):
+    path = tmp_path / "scenario.csv"
+    write_csv(scalar_data, path)
+    return path
+
+
+@pytest.mark.django_db()
+def bench_csv_import(benchmark, csv_path):
+    """Import scenario from CSV source (parse, validate and store)"""
+
+    def setup():
+        models.Source.objects.filter(name="CSV").delete()
+        csv_file = csv_path.open("rb")
+        return (CSVScenario("benchmark", settings.DataType.Scalar, csv_file),), {}
+
+    benchmark.group = "import"
+    benchmark.pedantic(lambda scenario: scenario.download(), setup=setup, rounds=3)
@@ -0,0 +1,34 @@
+import pytest
+
+from benchmarks.utils import get_request_data
+from django_comparison_dashboard import preprocessing
+from django_comparison_dashboard.filters import ScenarioFilter
+from django_comparison_dashboard.forms import DataFilterSet
+from django_comparison_dashboard.models import ScalarData
+
+GROUP_BY = {
+    "ungrouped": {},
+    "grouped": {"group_by": ["scenario", "sector", "year"], "order_by": ["year"]},
+    "grouped_by_array": {"group_by": ["groups", "year"], "order_by": ["year"]},
+}
+
+
+@pytest.mark.django_db()
+def bench_scenario_filter(benchmark, results):
+    """Build scenario filter including choices for all filter fields"""
+    benchmark.group = "filters"
+    benchmark(ScenarioFilter, "bar", None, queryset=ScalarData.objects.filter(result__in=results))
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("grouping", GROUP_BY.keys())
+def bench_get_scalar_data(benchmark, results, grouping):
+    """Query and preprocess scalar data"""
+
+    def setup():
+        filter_set = DataFilterSet(results, "bar", get_request_data(**GROUP_BY[grouping]))
+        assert filter_set.is_valid()
+        return (filter_set,), {}
+
+    benchmark.group = "get_scalar_data"
+    benchmark.pedantic(preprocessing.get_scalar_data, setup=setup, rounds=5)
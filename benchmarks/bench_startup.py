@@ -0,0 +1,26 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+IMPORT_URLS = "import django; django.setup(); import django_comparison_dashboard.urls"
+WARM_UP = IMPORT_URLS + "; from django_comparison_dashboard.lazy import warm_up; warm_up()"
+
+
+def run_python(code: str) -> None:
+    env = os.environ | {"DJANGO_SETTINGS_MODULE": "benchmarks.settings"}
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+
+
+def bench_startup(benchmark):
+    """Start interpreter, set up django and load URLconf (as done by management commands and worker boots)"""
+    benchmark.group = "startup"
+    benchmark.pedantic(run_python, args=(IMPORT_URLS,), rounds=5)
+
+
+def bench_startup_with_warm_up(benchmark):
+    """Same as startup, but load heavy modules upfront as done for production workers"""
+    benchmark.group = "startup"
+    benchmark.pedantic(run_python, args=(WARM_UP,), rounds=5)
@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.synthetic import Scale, generate_scalar_data, store_scalar_data
+from django_comparison_dashboard import models
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("synthetic data")
+    defaults = Scale()
+    group.addoption("--scenarios", type=int, default=defaults.scenarios, help="Number of synthetic scenarios")
+    group.addoption("--processes", type=int, default=defaults.processes, help="Number of processes per scenario")
+    group.addoption("--years", type=int, default=defaults.years, help="Number of years per process")
+    group.addoption("--groups", type=int, default=defaults.groups, help="Number of distinct groups")
+
+
+@pytest.fixture(scope="session")
+def scale(request) -> Scale:
+    return Scale(
+        scenarios=request.config.getoption("--scenarios"),
+        processes=request.config.getoption("--processes"),
+        years=request.config.getoption("--years"),
+        groups=request.config.getoption("--groups"),
+    )
+
+
+@pytest.fixture(scope="session")
+def scalar_data(scale):
+    return generate_scalar_data(scale)
+
+
+@pytest.fixture(scope="session")
+def results(django_db_setup, django_db_blocker, scalar_data) -> list[int]:
+    """Store synthetic data in DB, one result per scenario"""
+    with django_db_blocker.unblock():
+        source = models.Source.objects.create(name="Benchmark")
+        result_ids = []
+        for scenario, scenario_data in scalar_data.groupby("scenario"):
+            result = models.Result.objects.create(name=scenario, source=source)
+            store_scalar_data(scenario_data, result)
+            result_ids.append(result.id)
+        yield result_ids
+        source.delete()
@@ -0,0 +1,18 @@
+"""Django settings to run benchmarks against a throwaway Postgres DB (see DATABASE_URL in tests/.env)"""
+
+import pathlib
+
+import environ
+
+env = environ.Env()
+env.read_env(pathlib.Path(__file__).parent.parent / "tests" / ".env")
+
+SECRET_KEY = "benchmark"
+DATABASES = {"default": env.db("DATABASE_URL")}
+INSTALLED_APPS = (
+    "django.contrib.contenttypes",
+    "django.contrib.auth",
+    "django_comparison_dashboard",
+)
+USE_TZ = True
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -0,0 +1,94 @@
+"""Generator for synthetic scalar data in OEDatamodel format"""
+
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from django_comparison_dashboard import models
+
+SECTORS = ("pow", "ind", "tra", "hea")
+PARAMETERS = ("flow_volume", "capacity_inst", "cost_var")
+UNITS = {"flow_volume": "MWh", "capacity_inst": "MW", "cost_var": "MEUR"}
+
+
+@dataclass
+class Scale:
+    """Scale of synthetic data, resulting rows are scenarios x processes x years x parameters"""
+
+    scenarios: int = 2
+    processes: int = 200
+    years: int = 6
+    groups: int = 10
+
+    @property
+    def rows(self) -> int:
+        return self.scenarios * self.processes * self.years * len(PARAMETERS)
+
+
+def generate_scalar_data(scale: Scale, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate scalar data with given scale
+
+    Every process belongs to a sector, has one or two groups and an input and output group taken from `scale.groups`
+    different groups.
+
+    Parameters
+    ----------
+    scale: Scale
+        Scale of data
+    seed: int
+        Seed for random values
+
+    Returns
+    -------
+    pd.DataFrame
+        Scalar data using columns of oed_scalars schema
+    """
+    rng = np.random.default_rng(seed)
+    groups = [f"group_{i}" for i in range(scale.groups)]
+    processes = pd.DataFrame(
+        {
+            "process": [f"process_{i}" for i in range(scale.processes)],
+            "sector": [SECTORS[i % len(SECTORS)] for i in range(scale.processes)],
+            "category": [f"category_{i % 7}" for i in range(scale.processes)],
+            "specification": [f"specification_{i % 3}" for i in range(scale.processes)],
+            "groups": [
+                [groups[i % scale.groups], groups[(i * 7) % scale.groups]] if i % 2 else [groups[i % scale.groups]]
+                for i in range(scale.processes)
+            ],
+            "input_groups": [[groups[(i * 3) % scale.groups]] for i in range(scale.processes)],
+            "output_groups": [[groups[(i * 5 + 1) % scale.groups]] for i in range(scale.processes)],
+        }
+    )
+    index = pd.DataFrame(
+        itertools.product(
+            [f"scenario_{i}" for i in range(scale.scenarios)],
+            range(scale.processes),
+            range(2020, 2020 + 5 * scale.years, 5),
+            PARAMETERS,
+        ),
+        columns=["scenario", "process_index", "year", "parameter"],
+    )
+    data = index.join(processes, on="process_index").drop(columns="process_index")
+    data["new"] = rng.random(len(data)) > 0.5
+    data["unit"] = data["parameter"].map(UNITS)
+    data["value"] = rng.random(len(data)) * 1000
+    return data
+
+
+def write_csv(data: pd.DataFrame, path) -> None:
+    """Write data as CSV file as expected by CSV source (array fields as bracketed lists)"""
+    data = data.copy()
+    for column in ("groups", "input_groups", "output_groups"):
+        data[column] = data[column].map(lambda items: "[" + ", ".join(f'"{item}"' for item in items) + "]")
+    data.to_csv(path, sep=";", index=False)
+
+
+def store_scalar_data(data: pd.DataFrame, result: models.Result) -> None:
+    """Store data for given result in DB"""
+    models.ScalarData.objects.bulk_create(
+        (models.ScalarData(result=result, **item) for item in data.to_dict(orient="records")),
+        batch_size=10_000,
+    )
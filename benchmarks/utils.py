@@ -0,0 +1,42 @@
+from urllib.parse import urlencode
+
+from django.http import QueryDict
+
+from django_comparison_dashboard import forms
+
+DEFAULT_FILTER_DATA = {
+    "energy": "GWh",
+    "power": "GW",
+    "power_per_hour": "MW/h",
+    "costs": "MEUR",
+    "mass": "Gt",
+    "mass_per_year": "Gt/a",
+    "labels-TOTAL_FORMS": 0,
+    "labels-INITIAL_FORMS": 0,
+}
+
+GRAPH_FILTER_DATA = {
+    "bar": {"x": "year", "y": "value", "color": "sector", "hover_name": "scenario", "orientation": "v"}
+    | {"barmode": "relative", "facet_col_wrap": 1},
+    "line": {"x": "year", "y": "value", "color": "sector", "hover_name": "scenario", "facet_col_wrap": 1},
+    "sankey": {"nodes": "process", "inflow": "input_groups", "outflow": "output_groups"},
+}
+
+
+def get_request_data(**kwargs) -> QueryDict:
+    """Return request data as sent by dashboard, using default units and no labels or colors"""
+    data = DEFAULT_FILTER_DATA | {"colors-TOTAL_FORMS": 0, "colors-INITIAL_FORMS": 0} | kwargs
+    return QueryDict(urlencode(data, doseq=True))
+
+
+def get_graph_filter_set(chart_type: str, data_filter_set: forms.DataFilterSet | None = None, **kwargs):
+    """Return validated graph filter set for given chart type"""
+    from django_comparison_dashboard import graphs
+
+    form_class = graphs.CHART_DATA[chart_type]["form_class"]
+    graph_filter_set = form_class(
+        get_request_data(**GRAPH_FILTER_DATA[chart_type], **kwargs), data_filter_set=data_filter_set
+    )
+    if not graph_filter_set.is_valid():
+        raise ValueError(f"Invalid graph options: {graph_filter_set.bound_forms['graph_options_form'].errors}")
+    return graph_filter_set
@@ -11,6 +11,36 @@ class DashboardConf(AppConf):
     SCALAR_MODEL = "django_comparison_dashboard.ScalarData"
     TIMESERIES_MODEL = "django_comparison_dashboard.TimeseriesData"
 
+    # Adds Server-Timing header and logs stage timings for chart requests
+    PROFILING = False
+
+    # Dimension sets (i.e. [["scenario", "year", "sector", "parameter"]]) to pre-aggregate scalar data by at import
+    ROLLUP_DIMENSIONS = []
+
+    # Paths to structure workbooks by structure name; cached workbook data is reloaded if file has changed
+    STRUCTURE_WORKBOOKS = {}
+
+    # Number of results per page of scenario catalog
+    CATALOG_PAGE_SIZE = 50
+
+    # Number of threads running CPU-bound chart rendering and blocking source calls for async views
+    EXECUTOR_WORKERS = 4
+    # Number of threads producing streamed responses (data API), each stream occupies a thread for its whole transfer
+    STREAM_WORKERS = 4
+
+    # Number of processes building chart figures; if 0, figures are built within request thread
+    RENDER_PROCESSES = 0
+    # Maximum time in seconds to build a figure in render process
+    RENDER_TIMEOUT = 30
+    # Maximum address space in bytes per render process (unlimited if None)
+    RENDER_MEMORY_LIMIT = None
+
+    # Folder within default storage holding rendered static images of charts (content-addressed)
+    EXPORT_CACHE_DIR = "dashboard_exports"
+
+    # Number of rows read from DB and serialized at once when streaming data via data API or downloading data
+    DATA_API_CHUNK_SIZE = 10_000
+
     # pylint:disable=R0903
     class Meta:
         """
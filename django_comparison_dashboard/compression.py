@@ -0,0 +1,94 @@
+"""
+Compression of large dashboard responses (chart HTML, data exports and JSON)
+
+Responses are compressed using brotli if client accepts it and package `brotli` is installed, otherwise using gzip.
+Streamed responses are compressed chunk by chunk using gzip. Only textual content is compressed, as binary formats
+(images, Parquet, Arrow IPC) are compressed already or do not shrink notably.
+Responses compressed here are skipped by Django's `GZipMiddleware`, as their content encoding is already set.
+"""
+
+import re
+from collections.abc import AsyncIterable, AsyncIterator
+from gzip import GzipFile
+
+from django.utils.cache import patch_vary_headers
+from django.utils.text import StreamingBuffer, compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses smaller than this are sent uncompressed, as overhead outweighs savings
+MIN_LENGTH = 200
+# Brotli quality between 0 and 11; medium quality compresses better than gzip at similar speed
+BROTLI_QUALITY = 5
+
+ACCEPTS_BROTLI = re.compile(r"\bbr\b")
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+COMPRESSIBLE_TYPES = re.compile(r"^(text/|application/(json|x-ndjson|javascript)|image/svg\+xml)")
+
+
+async def acompress_sequence(sequence: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Gzip async sequence of bytes chunk by chunk (async variant of `django.utils.text.compress_sequence`)"""
+    buffer = StreamingBuffer()
+    with GzipFile(mode="wb", compresslevel=6, fileobj=buffer, mtime=0) as zfile:
+        yield buffer.read()
+        async for item in sequence:
+            zfile.write(item)
+            data = buffer.read()
+            if data:
+                yield data
+    yield buffer.read()
+
+
+def compress_response(request, response):
+    """
+    Compress content of response according to "Accept-Encoding" header of request
+
+    Parameters
+    ----------
+    request: HttpRequest
+        Request holding accepted encodings
+    response: HttpResponse | StreamingHttpResponse
+        Response to compress (binary and already encoded responses are returned unchanged)
+
+    Returns
+    -------
+    HttpResponse | StreamingHttpResponse
+        Compressed response
+    """
+    if response.has_header("Content-Encoding") or not COMPRESSIBLE_TYPES.match(response.get("Content-Type", "")):
+        return response
+    if response.streaming:
+        return compress_streaming_response(request, response)
+    if len(response.content) < MIN_LENGTH:
+        return response
+    patch_vary_headers(response, ("Accept-Encoding",))
+    accepted_encodings = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    if brotli is not None and ACCEPTS_BROTLI.search(accepted_encodings):
+        content, encoding = brotli.compress(response.content, quality=BROTLI_QUALITY), "br"
+    elif ACCEPTS_GZIP.search(accepted_encodings):
+        content, encoding = compress_string(response.content), "gzip"
+    else:
+        return response
+    if len(content) >= len(response.content):
+        return response
+    response.content = content
+    response["Content-Length"] = str(len(content))
+    response["Content-Encoding"] = encoding
+    return response
+
+
+def compress_streaming_response(request, response):
+    """Gzip streamed response chunk by chunk, if client accepts gzip"""
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if not ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+        return response
+    if response.is_async:
+        response.streaming_content = acompress_sequence(response.streaming_content)
+    else:
+        response.streaming_content = compress_sequence(response.streaming_content)
+    del response["Content-Length"]
+    response["Content-Encoding"] = "gzip"
+    return response
@@ -0,0 +1,199 @@
+"""
+Bounded executors for blocking work of async views
+
+CPU-bound preprocessing and plotting (pandas/plotly) as well as sync ORM and HTTP calls are run in a thread pool
+of fixed size (setting `DASHBOARD_EXECUTOR_WORKERS`), thus the event loop of an ASGI worker stays free to serve other
+requests while heavy charts are rendered.
+Streamed responses occupy a thread for their whole transfer, thus they are produced in a separate pool
+(setting `DASHBOARD_STREAM_WORKERS`) and slow clients cannot starve chart rendering.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+_stream_executor = None
+_executor_lock = threading.Lock()
+
+# Marks end of iterable in `ExecutorStream`
+_DONE = object()
+
+
+class _Failure:
+    """Wraps error raised while producing items in `ExecutorStream`"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return shared executor, which is created on first use"""
+    global _executor  # pylint:disable=W0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.DASHBOARD_EXECUTOR_WORKERS, thread_name_prefix="dashboard"
+            )
+    return _executor
+
+
+def get_stream_executor() -> ThreadPoolExecutor:
+    """Return executor producing streamed responses, which is created on first use"""
+    global _stream_executor  # pylint:disable=W0603
+    with _executor_lock:
+        if _stream_executor is None:
+            _stream_executor = ThreadPoolExecutor(
+                max_workers=settings.DASHBOARD_STREAM_WORKERS, thread_name_prefix="dashboard-stream"
+            )
+    return _stream_executor
+
+
+def _run_job(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # Executor threads are not part of Django's request cycle, thus DB connections are cleaned up per job
+        close_old_connections()
+
+
+async def run_in_executor(func, *args, **kwargs):
+    """
+    Run blocking function in bounded executor and await its result
+
+    Context variables (i.e. profiler of current request) are copied into the executor thread.
+
+    Parameters
+    ----------
+    func: Callable
+        Sync function to run
+    args, kwargs
+        Arguments passed to function
+
+    Returns
+    -------
+    Any
+        Result of function
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    job = functools.partial(context.run, _run_job, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), job)
+
+
+class ExecutorStream:
+    """
+    Async iterator consuming a sync iterable within a single thread of stream executor
+
+    Iterables bound to a DB connection (i.e. reading from a server-side cursor) stay in one thread, while the event
+    loop is free to send items meanwhile. At most `max_buffered` items are produced ahead of the consumer; the
+    producing thread blocks until the consumer takes items or the stream is closed.
+    Stream is closed (stopping iteration and closing the iterable) via `aclose` or via `close`, which is called by
+    Django when the response is closed and is safe to call from any thread.
+    """
+
+    def __init__(self, iterable: Iterable, max_buffered: int = 2):
+        self.iterable = iterable
+        self.max_buffered = max_buffered
+        self.stopped = threading.Event()
+        self.loop = None
+        self.queue = None
+        self.producer = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.producer is None:
+            self.start()
+        if self.stopped.is_set() and self.queue.empty():
+            raise StopAsyncIteration
+        item = await self.queue.get()
+        if item is _DONE:
+            self.stopped.set()
+            raise StopAsyncIteration
+        if isinstance(item, _Failure):
+            self.stopped.set()
+            raise item.error
+        return item
+
+    def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.max_buffered)
+        context = contextvars.copy_context()
+        self.producer = self.loop.run_in_executor(
+            get_stream_executor(), functools.partial(context.run, _run_job, self.produce)
+        )
+
+    def put(self, item) -> bool:
+        """Hand item over to event loop, blocking while buffer is full; return if stream is still open"""
+        if self.stopped.is_set():
+            return False
+        asyncio.run_coroutine_threadsafe(self.queue.put(item), self.loop).result()
+        return not self.stopped.is_set()
+
+    def produce(self) -> None:
+        iterator = iter(self.iterable)
+        try:
+            for item in iterator:
+                if not self.put(item):
+                    return
+            self.put(_DONE)
+        except Exception as error:  # pylint:disable=W0718
+            self.put(_Failure(error))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def drain(self) -> None:
+        # Removing buffered items wakes up a producer blocked on full buffer, which then sees the stream is stopped
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    def close(self) -> None:
+        """Stop producing items"""
+        self.stopped.set()
+        if self.loop is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.drain)
+        except RuntimeError:
+            # Event loop is closed already, thus producer cannot be blocked on it
+            pass
+
+    async def aclose(self) -> None:
+        """Stop producing items and wait for producer to finish"""
+        self.close()
+        if self.producer is not None:
+            await self.producer
+
+    def __del__(self):
+        # Django 4.2 does not close streaming content if client disconnects, thus producer is stopped at latest here
+        if not self.stopped.is_set():
+            self.close()
+
+
+def iterate_in_executor(iterable: Iterable, max_buffered: int = 2) -> ExecutorStream:
+    """
+    Consume sync iterable within a single thread of stream executor and yield its items asynchronously
+
+    Parameters
+    ----------
+    iterable: Iterable
+        Sync iterable to consume
+    max_buffered: int
+        Number of items produced ahead
+
+    Returns
+    -------
+    ExecutorStream
+        Async iterator over items of iterable
+    """
+    return ExecutorStream(iterable, max_buffered)
@@ -0,0 +1,212 @@
+"""
+Static image export of charts
+
+Charts of stored filter settings are rendered as PNG, SVG or PDF via kaleido (optional dependency).
+Rendered images are cached content-addressed in default storage (folder set via `DASHBOARD_EXPORT_CACHE_DIR`):
+the cache key is derived from the settings hash, selected results including their import time, format and size, thus
+cached images are reused until either settings or data change.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.utils.text import slugify
+
+from . import graphs, helpers, rendering
+from .models import FilterSettings, NamedFilterSettings, Result
+
+EXPORT_FORMATS = {"png": "image/png", "svg": "image/svg+xml", "pdf": "application/pdf"}
+# Maximum width and height of exported images in pixels, as each size is rendered and cached separately
+MAX_IMAGE_SIZE = 4000
+
+
+class ExportError(Exception):
+    """Thrown if chart cannot be exported"""
+
+
+def is_available() -> bool:
+    """Return if static image export is available (needs package kaleido)"""
+    return importlib.util.find_spec("kaleido") is not None
+
+
+def get_export_key(
+    filter_settings: FilterSettings,
+    result_ids: list[int],
+    image_format: str,
+    width: int | None = None,
+    height: int | None = None,
+) -> str:
+    """Return content address of exported chart"""
+    results = Result.objects.filter(id__in=result_ids).order_by("id").values_list("id", "imported_at")
+    content = json.dumps(
+        {
+            "settings": filter_settings.hash or filter_settings.id,
+            "results": list(results),
+            "format": image_format,
+            "size": [width, height],
+        },
+        cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_cache_path(key: str, image_format: str) -> str:
+    return f"{settings.DASHBOARD_EXPORT_CACHE_DIR}/{key[:2]}/{key}.{image_format}"
+
+
+def figure_to_image(figure, image_format: str, width: int | None = None, height: int | None = None) -> bytes:
+    """Render figure (or figure dict) as static image via kaleido"""
+    if not is_available():
+        raise ExportError("Static image export needs package 'kaleido' to be installed.")
+    from plotly import io as pio
+
+    return pio.to_image(figure, format=image_format, width=width, height=height, validate=False)
+
+
+def render_chart(
+    filter_settings: FilterSettings,
+    result_ids: list[int],
+    image_format: str,
+    width: int | None = None,
+    height: int | None = None,
+) -> bytes:
+    """Build chart of stored filter settings for given results and render it as static image"""
+    graph_parameters = dict(filter_settings.graph_filter_set)
+    chart_type = graph_parameters.pop("chart_type")
+    filter_set_context = helpers.FilterSetContext(
+        result_ids, chart_type, filter_settings.filter_set, graph_parameters, filter_settings.id
+    )
+    if not filter_set_context.filter_set.is_valid() or not filter_set_context.graph_filter_set.is_valid():
+        raise ExportError(f"Filter settings #{filter_settings.id} are not valid.")
+    try:
+        figure = rendering.render_figure(chart_type, filter_set_context.data, filter_set_context.graph_filter_set)
+    except (graphs.PlottingError, rendering.RenderingError) as error:
+        raise ExportError(str(error)) from error
+    return figure_to_image(figure, image_format, width, height)
+
+
+def export_chart(
+    filter_settings: FilterSettings,
+    result_ids: list[int],
+    image_format: str = "png",
+    width: int | None = None,
+    height: int | None = None,
+) -> bytes:
+    """
+    Return chart of stored filter settings for given results as static image
+
+    Image is taken from render cache if present, otherwise it is rendered and stored in cache.
+
+    Parameters
+    ----------
+    filter_settings: FilterSettings
+        Filter and graph settings of chart
+    result_ids: list[int]
+        Results to show in chart
+    image_format: str
+        One of EXPORT_FORMATS
+    width: int | None
+        Image width in pixels up to MAX_IMAGE_SIZE (kaleido's default if not set)
+    height: int | None
+        Image height in pixels up to MAX_IMAGE_SIZE (kaleido's default if not set)
+
+    Returns
+    -------
+    bytes
+        Image content
+
+    Raises
+    ------
+    ExportError
+        if format is unknown, size is out of range, settings are invalid or kaleido is not installed
+    """
+    if image_format not in EXPORT_FORMATS:
+        raise ExportError(f"Unknown export format '{image_format}'.")
+    if any(size is not None and not 1 <= size <= MAX_IMAGE_SIZE for size in (width, height)):
+        raise ExportError(f"Image width and height must be between 1 and {MAX_IMAGE_SIZE} pixels.")
+    path = get_cache_path(get_export_key(filter_settings, result_ids, image_format, width, height), image_format)
+    if default_storage.exists(path):
+        with default_storage.open(path) as cached_file:
+            return cached_file.read()
+    image = render_chart(filter_settings, result_ids, image_format, width, height)
+    store_in_cache(path, image)
+    return image
+
+
+def store_in_cache(path: str, image: bytes) -> None:
+    """
+    Store image at given cache path
+
+    Concurrent exports of the same chart store identical images at the same path, thus an existing file is replaced
+    instead of storing the image under an alternative name (as `Storage.save` does). Local files are replaced
+    atomically, thus readers never see partially written images.
+    """
+    try:
+        full_path = Path(default_storage.path(path))
+    except NotImplementedError:
+        # Remote storages (i.e. object storages) do not provide local paths
+        stored_path = default_storage.save(path, ContentFile(image))
+        if stored_path != path:
+            default_storage.delete(stored_path)
+        return
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=full_path.parent, suffix=".tmp", delete=False) as temp_file:
+        temp_file.write(image)
+    permissions = getattr(default_storage, "file_permissions_mode", None)
+    if permissions is not None:
+        os.chmod(temp_file.name, permissions)
+    os.replace(temp_file.name, full_path)
+
+
+def export_named_charts(
+    report_dir: Path, result_ids: list[int], image_format: str = "png", workers: int = 4
+) -> dict[str, Path | ExportError]:
+    """
+    Export charts of all named filter settings into report directory in parallel
+
+    Files are named by slugified name of filter settings.
+
+    Parameters
+    ----------
+    report_dir: Path
+        Directory to store images in (created if missing)
+    result_ids: list[int]
+        Results to show in charts
+    image_format: str
+        One of EXPORT_FORMATS
+    workers: int
+        Number of charts exported in parallel; loading data and building figures runs in parallel, whereas images
+        are rendered one after another (kaleido renders in a single Chromium process shared behind a lock)
+
+    Returns
+    -------
+    dict[str, Path | ExportError]
+        Path of exported image or export error per name of filter settings
+    """
+    report_dir.mkdir(parents=True, exist_ok=True)
+
+    def export_named_chart(named_filter_settings: NamedFilterSettings) -> Path | ExportError:
+        path = report_dir / f"{slugify(named_filter_settings.name)}.{image_format}"
+        try:
+            path.write_bytes(export_chart(named_filter_settings.filter_settings, result_ids, image_format))
+        except ExportError as error:
+            return error
+        finally:
+            # Each worker thread holds its own DB connection
+            connections.close_all()
+        return path
+
+    named_settings = list(NamedFilterSettings.objects.select_related("filter_settings").order_by("name"))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        exported = pool.map(export_named_chart, named_settings)
+        return {named.name: path for named, path in zip(named_settings, exported)}
@@ -78,6 +78,42 @@ class OrderAggregationForm(forms.Form):
     normalize = forms.BooleanField(
         label="Normalize Data", required=False, widget=forms.CheckboxInput(attrs={"class": "form-check-input"})
     )
+    normalize_by = forms.MultipleChoiceField(
+        label="Normalize per",
+        help_text="Values are normalized to their share of the total per chosen columns (and unit).",
+        choices=get_available_filters,
+        required=False,
+        widget=forms.SelectMultiple(attrs={"class": "ui fluid search dropdown"}),
+    )
+    reference_scenario = forms.ChoiceField(
+        label="Reference Scenario",
+        help_text="Values are related to values of reference scenario.",
+        choices=[("", "---")],
+        required=False,
+        widget=forms.Select(attrs={"class": "ui fluid dropdown clearable"}),
+    )
+    comparison_mode = forms.ChoiceField(
+        label="Comparison to Reference",
+        choices=[
+            ("ratio", "Share of reference (%)"),
+            ("difference", "Absolute difference"),
+            ("relative_difference", "Relative difference (%)"),
+        ],
+        initial="ratio",
+        required=False,
+        widget=forms.Select(attrs={"class": "ui fluid dropdown"}),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        group_by = cleaned_data.get("group_by")
+        if cleaned_data.get("normalize") and cleaned_data.get("reference_scenario"):
+            self.add_error("reference_scenario", "Please choose either normalization or a reference scenario.")
+        if group_by and not set(cleaned_data.get("normalize_by", [])).issubset(group_by):
+            self.add_error("normalize_by", "Please choose values that were also chosen in Group-By.")
+        if group_by and cleaned_data.get("reference_scenario") and "scenario" not in group_by:
+            self.add_error("reference_scenario", "Please add 'scenario' to Group-By to use a reference scenario.")
+        return cleaned_data
 
 
 class UnitForm(forms.Form):
@@ -430,6 +466,11 @@ class DataFilterSet(FilterSet):
         self.selected_scenarios = selected_scenarios
         scalar_data = ScalarData.objects.filter(result__in=selected_scenarios)
         self.bound_forms["scenario_filter"] = ScenarioFilter(chart_type, data, queryset=scalar_data)
+        # Reference scenario can be chosen from available scenarios
+        scenario_choices = self.bound_forms["scenario_filter"].filters["scenario"].extra["choices"]
+        self.bound_forms["order_aggregation_form"].fields["reference_scenario"].choices = [("", "---")] + list(
+            scenario_choices
+        )
         self.bound_forms["label_form"] = formset_factory(LabelForm, KeyValueFormset)(data, prefix="labels")
 
     @property
@@ -444,6 +485,22 @@ class DataFilterSet(FilterSet):
     def group_by(self):
         return self.bound_forms["order_aggregation_form"].cleaned_data["group_by"]
 
+    @property
+    def normalize(self):
+        return self.bound_forms["order_aggregation_form"].cleaned_data["normalize"]
+
+    @property
+    def normalize_by(self):
+        return self.bound_forms["order_aggregation_form"].cleaned_data["normalize_by"]
+
+    @property
+    def reference_scenario(self):
+        return self.bound_forms["order_aggregation_form"].cleaned_data["reference_scenario"] or None
+
+    @property
+    def comparison_mode(self):
+        return self.bound_forms["order_aggregation_form"].cleaned_data["comparison_mode"] or "ratio"
+
     @property
     def units(self):
         return self.bound_forms["unit_form"].cleaned_data.values()
@@ -473,7 +530,7 @@ class PlotFilterSet(FilterSet):
     @property
     def plot_options(self):
         if self.bound_forms["graph_options_form"].is_valid():
-            options = self.bound_forms["graph_options_form"].cleaned_data
+            options = dict(self.bound_forms["graph_options_form"].cleaned_data)
         colors_raw = self.bound_forms["color_form"].cleaned_data
         options["color_discrete_map"] = {
             key: value for key, value in zip(colors_raw["color_key"], colors_raw["color_value"])
@@ -482,7 +539,7 @@ class PlotFilterSet(FilterSet):
 
     @property
     def display_options(self):
-        return self.bound_forms["display_options_form"].cleaned_data
+        return dict(self.bound_forms["display_options_form"].cleaned_data)
 
 
 class BarGraphFilterSet(PlotFilterSet):
@@ -1,3 +1,4 @@
+import itertools
 import math
 import random
 
@@ -5,6 +6,7 @@ import numpy as np
 import pandas as pd
 from plotly import express as px
 from plotly import graph_objects as go
+from plotly.subplots import make_subplots
 
 from .forms import BarGraphFilterSet, LineGraphFilterSet, PlotFilterSet, SankeyGraphFilterSet
 from .settings import (
@@ -149,34 +151,118 @@ def adapt_plot_figure(figure: go.Figure, filter_set: PlotFilterSet, data: pd.Dat
     return figure
 
 
+def get_grouped_figure(
+    data: pd.DataFrame, plot_options: dict, trace_class: type, color_property: str = "marker_color", **trace_options
+) -> go.Figure:
+    """
+    Build figure with one trace per color group directly from data columns
+
+    Builds the same traces as plotly express would do for charts without subplots,
+    but slices the column arrays per color group instead of running plotly express' generic data preparation.
+
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Data to plot
+    plot_options: dict
+        Plot options from PlotFilterSet
+    trace_class: type
+        Trace class from plotly graph_objects (i.e. go.Bar or go.Scatter)
+    color_property: str
+        Trace property to set group color on
+    trace_options
+        Additional options passed to every trace
+
+    Returns
+    -------
+    go.Figure
+        Figure holding one trace per color group
+    """
+    x, y, color = plot_options["x"], plot_options["y"], plot_options["color"]
+    text, hover_name = plot_options["text"], plot_options["hover_name"]
+    missing_columns = [column for column in (x, y, color, text, hover_name) if column and column not in data]
+    if missing_columns:
+        raise PlottingError(f"Scalar plot error: Columns {missing_columns} not found in data.")
+
+    color_discrete_map = plot_options["color_discrete_map"]
+    color_sequence = itertools.cycle(px.colors.qualitative.Plotly)
+    x_values, y_values = data[x].to_numpy(), data[y].to_numpy()
+    text_values = data[text].to_numpy() if text else None
+    hover_values = data[hover_name].to_numpy() if hover_name else None
+
+    figure = make_subplots(rows=1, cols=1)
+    for name, indices in data.groupby(color, sort=False, dropna=False).indices.items():
+        name = str(name)
+        figure.add_trace(
+            trace_class(
+                x=x_values[indices],
+                y=y_values[indices],
+                text=text_values[indices] if text else None,
+                hovertext=hover_values[indices] if hover_name else None,
+                hovertemplate=(
+                    f"<b>%{{hovertext}}</b><br><br>{color}={name}<br>{x}=%{{x}}<br>{y}=%{{y}}<extra></extra>"
+                    if hover_name
+                    else f"{color}={name}<br>{x}=%{{x}}<br>{y}=%{{y}}<extra></extra>"
+                ),
+                name=name,
+                legendgroup=name,
+                showlegend=True,
+                **{color_property: color_discrete_map.get(name) or next(color_sequence)},
+                **trace_options,
+            )
+        )
+    figure.update_layout(legend_title_text=color, legend_tracegroupgap=0)
+    figure.update_xaxes(title_text=x)
+    figure.update_yaxes(title_text=y)
+    return figure
+
+
+def raise_plotting_error(error: ValueError):
+    if str(error) == "nan is not in list":
+        raise PlottingError(
+            f"Scalar plot error: {error} "
+            + "(This might occur due to 'nan' values in data. Please check data via 'Show data')",
+        )
+    raise PlottingError(f"Scalar plot error: {error}")
+
+
 def bar_plot(data: pd.DataFrame, filter_set: BarGraphFilterSet):
-    data_json = data.to_dict(orient="records")
+    plot_options = filter_set.plot_options
     try:
-        fig = px.bar(data_json, **filter_set.plot_options)
-    except ValueError as ve:
-        if str(ve) == "nan is not in list":
-            raise PlottingError(
-                f"Scalar plot error: {ve} "
-                + "(This might occur due to 'nan' values in data. Please check data via 'Show data')",
-            )
+        if plot_options["facet_col"]:
+            fig = px.bar(data, **plot_options)
         else:
-            raise PlottingError(f"Scalar plot error: {ve}")
+            fig = get_grouped_figure(
+                data,
+                plot_options,
+                go.Bar,
+                orientation=plot_options["orientation"],
+                alignmentgroup="True",
+                textposition="auto",
+            )
+            fig.for_each_trace(lambda trace: trace.update(offsetgroup=trace.name))
+            fig.update_layout(barmode=plot_options["barmode"])
+    except ValueError as ve:
+        raise_plotting_error(ve)
 
     return adapt_plot_figure(fig, filter_set, data)
 
 
 def line_plot(data, filter_set: LineGraphFilterSet):
-    data_json = data.to_dict(orient="records")
+    plot_options = filter_set.plot_options
     try:
-        fig = px.line(data_json, **filter_set.plot_options)
-    except ValueError as ve:
-        if str(ve) == "nan is not in list":
-            raise PlottingError(
-                f"Scalar plot error: {ve} "
-                + "(This might occur due to 'nan' values in data. Please check data via 'Show data')",
-            )
+        if plot_options["facet_col"]:
+            fig = px.line(data, **plot_options)
         else:
-            raise PlottingError(f"Scalar plot error: {ve}")
+            fig = get_grouped_figure(
+                data,
+                plot_options,
+                go.Scatter,
+                color_property="line_color",
+                mode="lines+markers+text" if plot_options["text"] else "lines",
+            )
+    except ValueError as ve:
+        raise_plotting_error(ve)
 
     return adapt_plot_figure(fig, filter_set, data)
 
@@ -225,8 +311,7 @@ def sankey(data, filter_set: SankeyGraphFilterSet):
 
         value.append(flow["value"])
 
-    colors_raw = filter_set.bound_forms["color_form"].cleaned_data
-    colors = {key: value for key, value in zip(colors_raw["color_key"], colors_raw["color_value"])}
+    colors = filter_set.plot_options["color_discrete_map"]
     node_colors = [get_color(label) for label in labels]
 
     # Map colors to links based on their source node with reduced opacity
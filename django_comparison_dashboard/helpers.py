@@ -1,28 +1,111 @@
-from django_comparison_dashboard import graphs
-from django_comparison_dashboard.forms import DataFilterSet
+import os
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from django_comparison_dashboard import graphs, preprocessing
+from django_comparison_dashboard.forms import DataFilterSet, PlotFilterSet
 from django_comparison_dashboard.models import FilterSettings, NamedFilterSettings
 
+# Unique abbreviations and modification time of workbook per structure name
+_abbreviations_cache: dict[str, tuple[float | None, np.ndarray]] = {}
+
+
+def get_abbreviations(structure_name: str) -> np.ndarray:
+    """
+    Return unique abbreviations from given structure workbook
+
+    Parsed abbreviations are cached per process.
+    If a workbook path is set for structure in setting `DASHBOARD_STRUCTURE_WORKBOOKS`, abbreviations are reloaded
+    as soon as modification time of workbook changes, otherwise (or if workbook is missing) they are kept until
+    process restarts.
+    """
+    from django_energysystem_viewer.views import get_excel_data
+
+    workbook = settings.DASHBOARD_STRUCTURE_WORKBOOKS.get(structure_name)
+    try:
+        modified = os.stat(workbook).st_mtime if workbook else None
+    except FileNotFoundError:
+        modified = None
+    cached = _abbreviations_cache.get(structure_name)
+    if cached is None or cached[0] != modified:
+        abbreviations = get_excel_data(structure_name, "abbreviations")["abbreviations"].unique()
+        _abbreviations_cache[structure_name] = (modified, abbreviations)
+    return _abbreviations_cache[structure_name][1]
+
+
+class FilterSetContext:
+    """
+    Request-scoped filter and graph settings
+
+    Data filter set (including its scenario filter queries), graph filter set and resulting data are built and
+    validated only once per request and shared by chart rendering, saving of settings and data export.
+    """
+
+    def __init__(
+        self,
+        selected_scenarios: list[int],
+        chart_type: str,
+        filter_parameters: dict,
+        graph_parameters: dict,
+        parameters_id: int | None = None,
+    ):
+        self.selected_scenarios = selected_scenarios
+        self.chart_type = chart_type
+        self.filter_parameters = filter_parameters
+        self.graph_parameters = graph_parameters
+        self.parameters_id = parameters_id
+
+    @classmethod
+    def from_request(cls, request) -> "FilterSetContext":
+        """Get settings from request parameters or from stored filter settings if `parameters_id` is given"""
+        selected_scenarios = request.GET.getlist("scenario_id")
+        if "parameters_id" in request.GET:
+            parameters = FilterSettings.objects.get(pk=request.GET["parameters_id"])
+            parameters.touch()
+            chart_type = parameters.graph_filter_set.pop("chart_type")
+            return cls(
+                selected_scenarios, chart_type, parameters.filter_set, parameters.graph_filter_set, parameters.id
+            )
+        return cls(selected_scenarios, request.GET.get("chart_type"), request.GET, request.GET)
+
+    @cached_property
+    def filter_set(self) -> DataFilterSet:
+        return DataFilterSet(self.selected_scenarios, self.chart_type, self.filter_parameters)
+
+    @cached_property
+    def graph_filter_set(self) -> PlotFilterSet:
+        form_class = graphs.CHART_DATA[self.chart_type]["form_class"]
+        return form_class(self.graph_parameters, data_filter_set=self.filter_set)
+
+    @cached_property
+    def data(self) -> pd.DataFrame:
+        return preprocessing.get_scalar_data(self.filter_set)
+
+    def save(self, name: str | None = None) -> int:
+        """
+        Store filter settings
+
+        Returns id of stored filter settings or, if name is given, id of named filter settings
+        """
+        if not self.filter_set.is_valid():
+            raise ValueError("Invalid filter data")
+        if not self.graph_filter_set.is_valid():
+            raise ValueError("Invalid graph data")
+
+        # Get or create snapshot of FilterSettings from form data
+        graph_filters = self.graph_filter_set.cleaned_data | {"chart_type": self.chart_type}
+        filter_settings = FilterSettings.get_or_create_snapshot(self.filter_set.cleaned_data, graph_filters)
+        if name:
+            named_filter_settings = NamedFilterSettings(name=name, filter_settings=filter_settings)
+            named_filter_settings.save()
+            return named_filter_settings.id
+        return filter_settings.id
+
 
 def save_filters(data, name: str | None = None):
     selected_scenarios = data.getlist("scenario_id")
     selected_chart_type = data.get("chart_type")
-    filter_set = DataFilterSet(selected_scenarios, selected_chart_type, data)
-    if not filter_set.is_valid():
-        raise ValueError("Invalid filter data")
-
-    selected_chart = graphs.CHART_DATA.get(selected_chart_type)
-    form_class = selected_chart["form_class"]
-    graph_filter_set = form_class(data, data_filter_set=filter_set)
-    if not graph_filter_set.is_valid():
-        raise ValueError("Invalid graph data")
-
-    # Create an instance of FilterSettings and assign the form data
-    graph_filters = graph_filter_set.cleaned_data
-    graph_filters["chart_type"] = selected_chart_type
-    filter_settings = FilterSettings(filter_set=filter_set.cleaned_data, graph_filter_set=graph_filters)
-    filter_settings.save()
-    if name:
-        named_filter_settings = NamedFilterSettings(name=name, filter_settings=filter_settings)
-        named_filter_settings.save()
-        return named_filter_settings.id
-    return filter_settings.id
+    return FilterSetContext(selected_scenarios, selected_chart_type, data, data).save(name)
@@ -0,0 +1,86 @@
+"""
+Deferred imports of heavy modules
+
+Modules depending on pandas, plotly or pandera are loaded on first attribute access, thus importing views (i.e. when
+loading URLconf in management commands) stays fast. Production workers can load everything upfront via `warm_up`.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    Proxy of a module which is imported on first attribute access
+
+    Import is done via `importlib.import_module` under a lock, thus concurrent first accesses (i.e. from executor
+    threads) wait for the module to be fully executed instead of seeing a partially initialized module, as
+    `importlib.util.LazyLoader` does.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lock = threading.Lock()
+        self._module = None
+
+    def __getattr__(self, attribute: str):
+        # Only called for attributes not found on proxy itself
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return getattr(self._module, attribute)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return module which is imported on first attribute access
+
+    Parameters
+    ----------
+    name: str
+        Absolute module name
+
+    Returns
+    -------
+    ModuleType
+        Module, if it has already been imported, otherwise lazy proxy of module
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+WARM_UP_MODULES = [
+    "pandas",
+    "pandera.io",
+    "plotly.express",
+    "django_comparison_dashboard.export",
+    "django_comparison_dashboard.graphs",
+    "django_comparison_dashboard.helpers",
+    "django_comparison_dashboard.preprocessing",
+    "django_comparison_dashboard.rendering",
+    "django_comparison_dashboard.sources",
+]
+
+
+def warm_up() -> None:
+    """
+    Import heavy modules and set up registries upfront
+
+    Meant to be called once per production worker (i.e. in gunicorn's `post_worker_init` hook), so that first
+    requests do not pay for deferred imports.
+    """
+    start = time.perf_counter()
+    for name in WARM_UP_MODULES:
+        importlib.import_module(name)
+    from django_comparison_dashboard import preprocessing, settings
+
+    preprocessing.setup_units()
+    settings.load_modex_output_schema()
+    settings.load_color_dict()
+    logging.info(f"Warmed up dashboard in {time.perf_counter() - start:.2f}s.")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from django_comparison_dashboard import rollups
+from django_comparison_dashboard.models import Result
+
+
+class Command(BaseCommand):
+    help = "(Re)build rollups configured in setting DASHBOARD_ROLLUP_DIMENSIONS for existing results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("result_ids", nargs="*", type=int, help="Results to build rollups for (default: all)")
+
+    def handle(self, *args, **options):
+        results = Result.objects.all()
+        if options["result_ids"]:
+            results = results.filter(pk__in=options["result_ids"])
+        for result in results:
+            rollups.build_rollups(result)
+            self.stdout.write(f"Built rollups for result '{result.name}'.")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from django_comparison_dashboard import stats
+from django_comparison_dashboard.models import Result
+
+
+class Command(BaseCommand):
+    help = "(Re)build statistics for existing results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("result_ids", nargs="*", type=int, help="Results to build statistics for (default: all)")
+
+    def handle(self, *args, **options):
+        results = Result.objects.all()
+        if options["result_ids"]:
+            results = results.filter(pk__in=options["result_ids"])
+        for result in results:
+            stats.build_statistics(result)
+            self.stdout.write(f"Built statistics for result '{result.name}'.")
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from django_comparison_dashboard.models import FilterSettings
+
+
+class Command(BaseCommand):
+    help = "Delete snapshots of filter settings which are not named and have not been used for given days"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90, help="Delete snapshots unused for given days")
+        parser.add_argument("--dry-run", action="store_true", help="Only count snapshots which would be deleted")
+
+    def handle(self, *args, **options):
+        orphaned = FilterSettings.objects.filter(
+            namedfiltersettings__isnull=True,
+            last_used__lt=timezone.now() - timedelta(days=options["days"]),
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"Would delete {orphaned.count()} orphaned filter settings.")
+            return
+        deleted, _ = orphaned.delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} orphaned filter settings."))
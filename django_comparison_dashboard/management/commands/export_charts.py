@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_comparison_dashboard import export
+from django_comparison_dashboard.models import Result
+
+
+class Command(BaseCommand):
+    help = "Export charts of all named filter settings as static images into report directory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("report_dir", type=Path, help="Directory to store images in")
+        parser.add_argument("--results", nargs="*", type=int, help="Results to show in charts (default: all)")
+        parser.add_argument("--format", default="png", choices=export.EXPORT_FORMATS.keys(), help="Image format")
+        parser.add_argument("--workers", type=int, default=4, help="Number of charts exported in parallel")
+
+    def handle(self, *args, **options):
+        if not export.is_available():
+            raise CommandError("Static image export needs package 'kaleido' to be installed.")
+        result_ids = options["results"] or list(Result.objects.values_list("id", flat=True))
+        exported = export.export_named_charts(options["report_dir"], result_ids, options["format"], options["workers"])
+        for name, path in exported.items():
+            if isinstance(path, export.ExportError):
+                self.stderr.write(f"Could not export chart '{name}': {path}")
+            else:
+                self.stdout.write(f"Exported chart '{name}' to '{path}'.")
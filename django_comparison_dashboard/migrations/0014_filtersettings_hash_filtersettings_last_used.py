@@ -0,0 +1,52 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:00
+
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def hash_filter_settings(apps, schema_editor):
+    """Add hash to existing filter settings, duplicates are kept without hash to not break existing links"""
+    FilterSettings = apps.get_model("django_comparison_dashboard", "FilterSettings")
+    hashes = set()
+    for filter_settings in FilterSettings.objects.order_by("id"):
+        normalized = json.dumps(
+            {"filter_set": filter_settings.filter_set, "graph_filter_set": filter_settings.graph_filter_set},
+            sort_keys=True,
+            separators=(",", ":"),
+            cls=DjangoJSONEncoder,
+        )
+        settings_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        if settings_hash in hashes:
+            continue
+        hashes.add(settings_hash)
+        filter_settings.hash = settings_hash
+        filter_settings.save(update_fields=["hash"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_comparison_dashboard", "0013_remove_scalardata_input_commodity_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="filtersettings",
+            name="hash",
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="filtersettings",
+            name="last_used",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(hash_filter_settings, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="filtersettings",
+            name="hash",
+            field=models.CharField(max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:01
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_comparison_dashboard", "0014_filtersettings_hash_filtersettings_last_used"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Rollup",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("dimensions", models.CharField(max_length=255)),
+                ("row_count", models.IntegerField()),
+                (
+                    "result",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="django_comparison_dashboard.result",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="RollupData",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("scenario", models.CharField(max_length=255, null=True)),
+                ("process", models.CharField(max_length=255, null=True)),
+                ("parameter", models.CharField(max_length=255, null=True)),
+                ("value", models.FloatField()),
+                ("year", models.IntegerField(null=True)),
+                ("sector", models.CharField(max_length=255, null=True)),
+                ("category", models.CharField(max_length=255, null=True)),
+                ("specification", models.CharField(max_length=255, null=True)),
+                ("new", models.BooleanField(null=True)),
+                ("unit", models.CharField(max_length=255)),
+                (
+                    "groups",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255), null=True, size=None
+                    ),
+                ),
+                (
+                    "input_groups",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255), null=True, size=None
+                    ),
+                ),
+                (
+                    "output_groups",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255), null=True, size=None
+                    ),
+                ),
+                (
+                    "rollup",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="data",
+                        to="django_comparison_dashboard.rollup",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="rollup",
+            constraint=models.UniqueConstraint(fields=("result", "dimensions"), name="unique_rollup_dimensions"),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:06
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_comparison_dashboard", "0015_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimeseriesData",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("scenario", models.CharField(max_length=255)),
+                ("process", models.CharField(max_length=255)),
+                ("parameter", models.CharField(max_length=255)),
+                ("year", models.IntegerField()),
+                ("sector", models.CharField(max_length=255)),
+                ("category", models.CharField(max_length=255, null=True)),
+                ("specification", models.CharField(max_length=255, null=True)),
+                ("new", models.BooleanField()),
+                ("unit", models.CharField(max_length=255)),
+                (
+                    "groups",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255), null=True, size=None
+                    ),
+                ),
+                (
+                    "input_groups",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255), null=True, size=None
+                    ),
+                ),
+                (
+                    "output_groups",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255), null=True, size=None
+                    ),
+                ),
+                ("timeindex_start", models.DateTimeField()),
+                ("timeindex_resolution", models.DurationField()),
+                ("length", models.IntegerField()),
+                ("series", models.BinaryField()),
+                (
+                    "result",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeseries",
+                        to="django_comparison_dashboard.result",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:16
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_rows(apps, schema_editor):
+    """Set row count of existing results (scalar data only, as timeseries have not been stored yet)"""
+    Result = apps.get_model("django_comparison_dashboard", "Result")
+    ScalarData = apps.get_model("django_comparison_dashboard", "ScalarData")
+    row_counts = (
+        ScalarData.objects.filter(result=OuterRef("pk")).order_by().values("result").annotate(count=Count("id"))
+    )
+    Result.objects.update(row_count=Coalesce(Subquery(row_counts.values("count"), output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_comparison_dashboard", "0016_timeseriesdata"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="result",
+            name="imported_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="row_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:17
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_comparison_dashboard", "0017_result_row_count_imported_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResultStatistics",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("year_min", models.IntegerField(null=True)),
+                ("year_max", models.IntegerField(null=True)),
+                ("value_min", models.FloatField(null=True)),
+                ("value_max", models.FloatField(null=True)),
+                (
+                    "units",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255), default=list, size=None
+                    ),
+                ),
+                ("distinct_counts", models.JSONField(default=dict)),
+                (
+                    "result",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="statistics",
+                        to="django_comparison_dashboard.result",
+                    ),
+                ),
+            ],
+        ),
+    ]
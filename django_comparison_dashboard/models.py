@@ -1,5 +1,11 @@
+import hashlib
+import json
+from datetime import timedelta
+
 from django.contrib.postgres.fields import ArrayField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 
 class Source(models.Model):
@@ -12,6 +18,10 @@ class Result(models.Model):
     name = models.CharField(max_length=255)
     source = models.ForeignKey(Source, on_delete=models.CASCADE, related_name="results")
 
+    # Denormalized import metadata, updated whenever data is stored for result
+    row_count = models.IntegerField(default=0)
+    imported_at = models.DateTimeField(null=True)
+
 
 class ScalarData(models.Model):
     id = models.BigAutoField(primary_key=True)
@@ -46,9 +56,140 @@ class ScalarData(models.Model):
     ]
 
 
+class TimeseriesData(models.Model):
+    """
+    Timeseries data
+
+    Holds same dimensions as ScalarData. Series are stored compressed (see `timeseries.encode_series`), timeindex is
+    given by start, resolution and length of series.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    result = models.ForeignKey(Result, on_delete=models.CASCADE, related_name="timeseries")
+
+    scenario = models.CharField(max_length=255)
+    process = models.CharField(max_length=255)
+    parameter = models.CharField(max_length=255)
+    year = models.IntegerField()
+    sector = models.CharField(max_length=255)
+    category = models.CharField(max_length=255, null=True)
+    specification = models.CharField(max_length=255, null=True)
+    new = models.BooleanField()
+    unit = models.CharField(max_length=255)
+    groups = ArrayField(models.CharField(max_length=255), null=True)
+    input_groups = ArrayField(models.CharField(max_length=255), null=True)
+    output_groups = ArrayField(models.CharField(max_length=255), null=True)
+    timeindex_start = models.DateTimeField()
+    timeindex_resolution = models.DurationField()
+    length = models.IntegerField()
+    series = models.BinaryField()
+
+    filters = ScalarData.filters
+
+
+class ResultStatistics(models.Model):
+    """
+    Statistics of result data, computed at import (see `stats.build_statistics`)
+
+    Distinct counts are stored per filter column; for array columns distinct combinations are counted.
+    Value range is only given for scalar data.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    result = models.OneToOneField(Result, on_delete=models.CASCADE, related_name="statistics")
+    year_min = models.IntegerField(null=True)
+    year_max = models.IntegerField(null=True)
+    value_min = models.FloatField(null=True)
+    value_max = models.FloatField(null=True)
+    units = ArrayField(models.CharField(max_length=255), default=list)
+    distinct_counts = models.JSONField(default=dict)
+
+
+class Rollup(models.Model):
+    """Scalar data of a result pre-aggregated by a set of dimensions (see setting `DASHBOARD_ROLLUP_DIMENSIONS`)"""
+
+    id = models.BigAutoField(primary_key=True)
+    result = models.ForeignKey(Result, on_delete=models.CASCADE, related_name="rollups")
+    dimensions = models.CharField(max_length=255)
+    row_count = models.IntegerField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["result", "dimensions"], name="unique_rollup_dimensions")]
+
+
+class RollupData(models.Model):
+    """
+    Aggregated scalar data
+
+    Holds same fields as ScalarData, thus filters can be applied likewise.
+    Fields not part of the dimensions of related rollup are empty.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    rollup = models.ForeignKey(Rollup, on_delete=models.CASCADE, related_name="data")
+
+    scenario = models.CharField(max_length=255, null=True)
+    process = models.CharField(max_length=255, null=True)
+    parameter = models.CharField(max_length=255, null=True)
+    value = models.FloatField()
+    year = models.IntegerField(null=True)
+    sector = models.CharField(max_length=255, null=True)
+    category = models.CharField(max_length=255, null=True)
+    specification = models.CharField(max_length=255, null=True)
+    new = models.BooleanField(null=True)
+    unit = models.CharField(max_length=255)
+    groups = ArrayField(models.CharField(max_length=255), null=True)
+    input_groups = ArrayField(models.CharField(max_length=255), null=True)
+    output_groups = ArrayField(models.CharField(max_length=255), null=True)
+
+    filters = ScalarData.filters
+
+
 class FilterSettings(models.Model):
+    """
+    Snapshot of filter and graph settings
+
+    Snapshots are unique by hash of their normalized settings and therefore can be used as cache keys.
+    Snapshots created before hashing was introduced may be duplicates, those have no hash.
+    """
+
     filter_set = models.JSONField()
     graph_filter_set = models.JSONField()
+    hash = models.CharField(max_length=64, unique=True, null=True)
+    last_used = models.DateTimeField(default=timezone.now)
+
+    @staticmethod
+    def get_hash(filter_set: dict, graph_filter_set: dict) -> str:
+        """Return hash of normalized settings (sorted keys, compact JSON)"""
+        normalized = json.dumps(
+            {"filter_set": filter_set, "graph_filter_set": graph_filter_set},
+            sort_keys=True,
+            separators=(",", ":"),
+            cls=DjangoJSONEncoder,
+        )
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get_or_create_snapshot(cls, filter_set: dict, graph_filter_set: dict) -> "FilterSettings":
+        """Return existing snapshot for given settings or create a new one"""
+        filter_settings, created = cls.objects.get_or_create(
+            hash=cls.get_hash(filter_set, graph_filter_set),
+            defaults={"filter_set": filter_set, "graph_filter_set": graph_filter_set},
+        )
+        if not created:
+            filter_settings.touch()
+        return filter_settings
+
+    def touch(self):
+        """
+        Mark snapshot as used
+
+        To keep loading of snapshots cheap, `last_used` is written at most once a day.
+        """
+        now = timezone.now()
+        if self.last_used < now - timedelta(days=1):
+            self.last_used = now
+            FilterSettings.objects.filter(pk=self.pk).update(last_used=now)
 
 
 class NamedFilterSettings(models.Model):
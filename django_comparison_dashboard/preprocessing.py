@@ -1,19 +1,33 @@
+import functools
+import itertools
 import warnings
+from collections.abc import Iterator
 
+import numpy as np
 import pandas as pd
-from django.db.models import Sum
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import CharField, Func, QuerySet, Sum, Value
 from units import NamedComposedUnit, scaled_unit, unit
 from units.exception import IncompatibleUnitsError
 from units.predefined import define_units
 from units.registry import REGISTRY
 
+from . import profiling, rollups, settings, streaming, timeseries
 from .forms import DataFilterSet
+from .models import ScalarData, TimeseriesData
 
 
 class PreprocessingError(Exception):
     """Raised if preprocessing fails"""
 
 
+class ArrayToString(Func):
+    """Join array elements into string in DB"""
+
+    function = "array_to_string"
+    output_field = CharField()
+
+
 def define_energy_model_units():
     scaled_unit("kW", "W", 1e3)
     scaled_unit("MW", "kW", 1e3)
@@ -45,128 +59,384 @@ def define_energy_model_units():
     NamedComposedUnit("TW/h", unit("TW") / unit("h"))
 
 
-define_units()
-define_energy_model_units()
+@functools.cache
+def setup_units():
+    """Set up unit registry, done once on first unit conversion"""
+    define_units()
+    define_energy_model_units()
 
 
 def get_scalar_data(filter_set: DataFilterSet) -> pd.DataFrame:
     if filter_set.group_by:
-        queryset = filter_set.queryset.values(*(filter_set.group_by + ["unit"])).annotate(value=Sum("value"))
+        columns = filter_set.group_by + ["unit"]
+        queryset = rollups.get_rollup_queryset(filter_set)
+        if queryset is None:
+            queryset = filter_set.queryset
+        queryset = get_values(queryset, columns).annotate(value=Sum("value"))
+        columns.append("value")
     else:
-        queryset = filter_set.queryset.values()
+        columns = [field.attname for field in ScalarData._meta.concrete_fields]
+        queryset = get_values(filter_set.queryset, columns)
+
+    with profiling.stage("fetch") as fetch_stage:
+        df = queryset_to_df(queryset, columns)
+        fetch_stage.rows = len(df)
 
     # Following preprocessing steps cannot be done in DB
-    df = pd.DataFrame(queryset)
-    df = convert_list_columns(df)
-    df = apply_labels_in_df(df, filter_set.labels)
-    df = convert_units_in_df(df, filter_set.units)
-    df = aggregate_df(df, filter_set.group_by)
-    df = df.sort_values(filter_set.order_by)
+    with profiling.stage("labels"):
+        df = apply_labels_in_df(df, filter_set.labels)
+    with profiling.stage("units"):
+        df = convert_units_in_df(df, filter_set.units)
+    with profiling.stage("aggregate") as aggregate_stage:
+        df = aggregate_df(df, filter_set.group_by)
+        if filter_set.normalize:
+            df = normalize_df(df, filter_set.normalize_by)
+        if filter_set.reference_scenario:
+            # Labels have already been applied, thus reference scenario may have been relabelled
+            reference_scenario = filter_set.labels.get(filter_set.reference_scenario, filter_set.reference_scenario)
+            df = compare_to_reference_scenario(df, reference_scenario, filter_set.comparison_mode)
+        df = df.sort_values(filter_set.order_by)
+        aggregate_stage.rows = len(df)
     return df
 
 
+def get_scalar_columns(filter_set: DataFilterSet) -> list[str]:
+    """Return columns of scalar data as returned by `get_scalar_data` for given filter set"""
+    if filter_set.group_by:
+        return filter_set.group_by + ["unit", "value"]
+    return [field.attname for field in ScalarData._meta.concrete_fields]
+
+
+def iter_scalar_data(
+    filter_set: DataFilterSet, columns: list[str] | None = None, chunk_size: int = 10_000
+) -> Iterator[pd.DataFrame]:
+    """
+    Load scalar data in chunks, restricted to given columns
+
+    If data has to be processed as a whole (grouping, normalization or comparison to reference scenario), it is
+    loaded via `get_scalar_data` and split afterwards. Otherwise, rows are ordered within DB and read via server-side
+    cursor, thus memory is bounded by chunk size; labels and units are applied per chunk.
+
+    Parameters
+    ----------
+    filter_set: DataFilterSet
+        Validated data filter set
+    columns: list[str] | None
+        Columns to return (see `get_scalar_columns`), all columns are returned by default
+    chunk_size: int
+        Number of rows per chunk
+
+    Yields
+    ------
+    pd.DataFrame
+        Chunk of scalar data
+    """
+    if columns is None:
+        columns = get_scalar_columns(filter_set)
+    if filter_set.group_by or filter_set.normalize or filter_set.reference_scenario:
+        yield from streaming.split_frame(get_scalar_data(filter_set)[columns], chunk_size)
+        return
+
+    # Unit and value are needed for unit conversion, even if they are not requested
+    fetch_columns = columns + [column for column in ("unit", "value") if column not in columns]
+    queryset = get_values(filter_set.queryset.order_by(*filter_set.order_by), fetch_columns)
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        df = queryset_to_df(chunk, fetch_columns)
+        df = apply_labels_in_df(df, filter_set.labels)
+        df = convert_units_in_df(df, filter_set.units)
+        yield df[columns]
+
+
+def get_timeseries_data(
+    queryset: QuerySet,
+    columns: list[str] | None = None,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    period: str | None = None,
+    method: str = "sum",
+) -> pd.DataFrame:
+    """
+    Load timeseries data from queryset
+
+    If a time window or resampling period is given, series are cut and resampled in bulk (see
+    `timeseries.window_and_resample`) and column "timeindex" holds the resulting timestamps.
+    Timeseries not overlapping with time window are already excluded within DB.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+        Timeseries data to load
+    columns: list[str] | None
+        Columns to load, all columns are loaded by default
+    start: pd.Timestamp | None
+        Start of time window
+    end: pd.Timestamp | None
+        End of time window
+    period: str | None
+        Period to resample series to ("day", "week" or "month")
+    method: str
+        Method to aggregate values within period ("sum", "mean", "max" or "min")
+
+    Returns
+    -------
+    pd.DataFrame
+        Timeseries data holding series as numpy arrays in column "series"
+    """
+    if columns is None:
+        columns = [field.attname for field in TimeseriesData._meta.concrete_fields]
+    resample = start is not None or end is not None or period is not None
+    if resample:
+        columns = columns + [column for column in timeseries.TIMEINDEX_COLUMNS + ["series"] if column not in columns]
+        queryset = timeseries.filter_window(queryset, start, end)
+
+    with profiling.stage("fetch") as fetch_stage:
+        df = queryset_to_df(get_values(queryset, columns), columns)
+        fetch_stage.rows = len(df)
+    if df.empty or "series" not in df:
+        return df
+    with profiling.stage("resample"):
+        df["series"] = timeseries.decode_series_column(df["series"])
+        if resample:
+            df = timeseries.window_and_resample(df, start, end, period, method)
+    return df
+
+
+def get_values(queryset: QuerySet, columns: list[str]) -> QuerySet:
+    """
+    Select given columns from queryset
+
+    Array fields are joined into strings (using `settings.ARRAY_JOINER`) within the DB query.
+    As annotations must not be named like model fields, joined array fields are suffixed and have to be renamed
+    afterwards (see `queryset_to_df`).
+
+    Parameters
+    ----------
+    queryset: QuerySet
+        Queryset to select values from
+    columns: list[str]
+        Columns to select
+
+    Returns
+    -------
+    QuerySet
+        Values queryset
+    """
+    fields = []
+    expressions = {}
+    for column in columns:
+        if isinstance(queryset.model._meta.get_field(column), ArrayField):
+            expressions[f"{column}_joined"] = ArrayToString(column, Value(settings.ARRAY_JOINER))
+        else:
+            fields.append(column)
+    return queryset.values(*fields, **expressions)
+
+
+def queryset_to_df(queryset: QuerySet, columns: list[str]) -> pd.DataFrame:
+    """
+    Load values queryset into dataframe with given columns
+
+    Parameters
+    ----------
+    queryset: QuerySet
+        Values queryset created via `get_values`
+    columns: list[str]
+        Columns to return, in order
+
+    Returns
+    -------
+    pd.DataFrame
+        Data from queryset
+    """
+    df = pd.DataFrame.from_records(queryset)
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    df = df.rename(columns={f"{column}_joined": column for column in columns})
+    return df[columns]
+
+
 def aggregate_df(df: pd.DataFrame, groupby: list[str]) -> pd.DataFrame:
     if df.empty:
         return df
 
     if groupby:
-        if "series" in df and len(df["series"].apply(len).unique()) > 1:
-            raise PreprocessingError("Different ts lengths at aggregation found.")
-
-        # Columns containing list have to be converted as they are unhashable
-        list_columns = [column for column in df.columns if isinstance(df[column][0], list)]
-        df[list_columns] = df[list_columns].map(frozenset)
-
+        if "series" in df:
+            return aggregate_series(df, groupby + ["unit"])
         df = df.groupby(groupby + ["unit"]).aggregate("sum").reset_index()
-        keep_columns = groupby + ["unit", "value", "series"]
+        keep_columns = groupby + ["unit", "value"]
         df = df[df.columns.intersection(keep_columns)]
     return df
 
 
-def convert_units_in_df(df: pd.DataFrame, units: list[str]) -> pd.DataFrame:
+def aggregate_series(df: pd.DataFrame, groupby: list[str]) -> pd.DataFrame:
     """
-    Convert values and values in series (timeseries data) depending on given units
+    Sum up series per group
+
+    Series are stacked into a matrix and rows are summed per group via `numpy.add.reduceat`.
 
     Parameters
     ----------
-    df
-        Dataframe to convert
-    units
-        Desired unit conversions
+    df: pd.DataFrame
+        Data holding series as numpy arrays in column "series" (and optionally related timeindex in column
+        "timeindex", which is taken from first series per group)
+    groupby: list[str]
+        Columns to group by
+
     Returns
     -------
-    Dataframe holding converted units
+    pd.DataFrame
+        Aggregated data holding group columns and summed series
     """
+    if df["series"].map(len).nunique() > 1:
+        raise PreprocessingError("Different ts lengths at aggregation found.")
+    grouped = df.groupby(groupby, dropna=False, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    starts = np.searchsorted(codes[order], np.arange(grouped.ngroups))
+    series = np.add.reduceat(np.stack(df["series"].to_numpy())[order], starts, axis=0)
+    aggregated = grouped.size().index.to_frame(index=False)
+    aggregated["series"] = list(series)
+    if "timeindex" in df:
+        aggregated["timeindex"] = df["timeindex"].to_numpy()[order[starts]]
+    return aggregated
+
+
+def normalize_df(df: pd.DataFrame, normalize_by: list[str]) -> pd.DataFrame:
+    """
+    Normalize values to their share of total (in percent)
 
-    def convert_units(row: pd.Series, convert_to: str):
-        """
-        Tries to convert value of row, given current unit of the row and conversion unit
-
-        Parameters
-        ----------
-        row
-            Current dataframe row
-        convert_to
-            Unit to convert value to
-        Returns
-        -------
-            Converted row if conversion has been successful, otherwise unchanged row is returned
-        """
-        if "unit" not in row or row["unit"] not in REGISTRY:
-            return row
-        if "value" in row:
-            value = unit(row["unit"])(row["value"])
-            try:
-                row["value"] = unit(convert_to)(value).get_num()
-            except IncompatibleUnitsError:
-                return row
-        elif "series" in row:
-            try:
-                mul = unit(convert_to)(unit(row["unit"])(1)).get_num()
-            except IncompatibleUnitsError:
-                return row
-            row["series"] = row["series"] * mul
-        else:
-            return row
-        row["unit"] = convert_to
-        return row
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Data to normalize
+    normalize_by: list[str]
+        Columns to calculate total per, values are always summed per unit additionally
 
-    # Check if unit conversion exists in unit registry
+    Returns
+    -------
+    pd.DataFrame
+        Data holding shares in percent
+    """
     if df.empty:
         return df
-    all_units = df["unit"].unique()
-    for unit_ in all_units:
-        if unit_ not in REGISTRY:
-            warnings.warn(f"Unknown unit '{unit_}' found in data.")
-
-    for unit_ in units:
-        df = df.apply(convert_units, axis=1, convert_to=unit_)
+    totals = df.groupby(normalize_by + ["unit"], dropna=False, observed=True)["value"].transform("sum")
+    df["value"] = df["value"] / totals * 100
+    df["unit"] = "%"
     return df
 
 
-def convert_list_columns(df: pd.DataFrame) -> pd.DataFrame:
+def compare_to_reference_scenario(df: pd.DataFrame, reference_scenario: str, mode: str = "ratio") -> pd.DataFrame:
     """
-    Convert columns containing list into joined strings
+    Compare values to values of reference scenario
+
+    Rows are aligned with rows of reference scenario on all remaining columns (except from ids) using a single join.
+    Values without matching reference value are set to NaN.
 
     Parameters
     ----------
     df: pd.DataFrame
-        check list columns in dataframe
+        Data to compare, must contain column "scenario"
+    reference_scenario: str
+        Scenario to compare values to
+    mode: str
+        One of "ratio" (value relative to reference in percent), "difference" (absolute difference in original unit)
+        or "relative_difference" (difference relative to reference in percent)
 
     Returns
     -------
     pd.DataFrame
-        Cleaned dataframe containing joined strings instead of lists
+        Data holding compared values
+    """
+    if df.empty:
+        return df
+    if "scenario" not in df.columns:
+        raise PreprocessingError("Column 'scenario' is needed to compare data to reference scenario.")
+    keys = [column for column in df.columns if column not in ("id", "result_id", "scenario", "value")]
+    reference_values = (
+        df.loc[df["scenario"] == reference_scenario]
+        .groupby(keys, dropna=False, observed=True)["value"]
+        .sum()
+        .rename("reference")
+    )
+    reference = df[keys].join(reference_values, on=keys)["reference"]
+    if mode == "difference":
+        df["value"] = df["value"] - reference
+        return df
+    if mode == "ratio":
+        values = df["value"] / reference * 100
+    elif mode == "relative_difference":
+        values = (df["value"] - reference) / reference * 100
+    else:
+        raise PreprocessingError(f"Unknown comparison mode '{mode}'.")
+    df["value"] = values.replace([np.inf, -np.inf], np.nan)
+    df["unit"] = "%"
+    return df
+
+
+def convert_units_in_df(df: pd.DataFrame, units: list[str]) -> pd.DataFrame:
     """
-    list_columns = [column for column in df.columns if isinstance(df[column][0], list)]
-    df[list_columns] = df[list_columns].map(lambda x: "/".join(x) if isinstance(x, (list, frozenset)) else x)
+    Convert values and values in series (timeseries data) depending on given units
+
+    Conversion factors are determined once per distinct unit and applied to whole columns.
+    Units are converted in order of given units, thus the last matching unit wins.
+
+    Parameters
+    ----------
+    df
+        Dataframe to convert
+    units
+        Desired unit conversions
+    Returns
+    -------
+    Dataframe holding converted units
+    """
+    # Check if unit conversion exists in unit registry
+    if df.empty:
+        return df
+    setup_units()
+    all_units = df["unit"].unique()
+    for unit_ in all_units:
+        if unit_ not in REGISTRY:
+            warnings.warn(f"Unknown unit '{unit_}' found in data.")
+
+    for convert_to in units:
+        factors = {}
+        for unit_ in df["unit"].unique():
+            factor = get_conversion_factor(unit_, convert_to)
+            if factor is not None:
+                factors[unit_] = factor
+        if not factors:
+            continue
+        factor = df["unit"].map(factors)
+        convertible = factor.notna()
+        if "value" in df:
+            df.loc[convertible, "value"] = df.loc[convertible, "value"] * factor[convertible]
+        elif "series" in df:
+            df.loc[convertible, "series"] = df.loc[convertible, "series"] * factor[convertible]
+        else:
+            return df
+        df.loc[convertible, "unit"] = convert_to
     return df
 
 
+@functools.cache
+def get_conversion_factor(from_unit: str, to_unit: str) -> float | None:
+    """Return factor to convert values from one unit into another or None if units are unknown or incompatible"""
+    if from_unit not in REGISTRY:
+        return None
+    try:
+        return unit(to_unit)(unit(from_unit)(1)).get_num()
+    except IncompatibleUnitsError:
+        return None
+
+
 def apply_labels_in_df(df: pd.DataFrame, labels: dict[str, str]) -> pd.DataFrame:
     """
     Map labels to their respective values given by user
 
+    Labels are only applied to string and categorical columns which contain at least one label key.
+    Replacement is done per column on its distinct values, thus cost scales with distinct values instead of cells.
+
     Parameters
     ----------
     df: pd.DataFrame
@@ -179,11 +449,30 @@ def apply_labels_in_df(df: pd.DataFrame, labels: dict[str, str]) -> pd.DataFrame
     pd.DataFrame
         Resulting dataframe with labels applied
     """
+    if df.empty or not labels:
+        return df
 
-    def apply_label(value, labels):
-        try:
-            return labels.get(value, value)
-        except TypeError:
-            return value
-
-    return df.map(apply_label, labels=labels)
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            if not categories.isin(labels.keys()).any():
+                continue
+            renamed = [labels.get(category, category) for category in categories]
+            if len(set(renamed)) == len(renamed):
+                df[column] = series.cat.rename_categories(renamed)
+            else:
+                # Several labels map onto same name, thus categories have to be merged
+                df[column] = series.astype(object).replace(labels).astype("category")
+        elif pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+            try:
+                distinct_values = series.unique()
+            except TypeError:
+                # Column contains unhashable values (i.e. lists)
+                continue
+            column_labels = {
+                value: labels[value] for value in distinct_values if isinstance(value, str) and value in labels
+            }
+            if column_labels:
+                df[column] = series.replace(column_labels)
+    return df
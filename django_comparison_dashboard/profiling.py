@@ -0,0 +1,110 @@
+"""
+Lightweight profiling of dashboard requests
+
+Profiling is activated via setting `DASHBOARD_PROFILING`. If active, profiled views measure time, DB queries and
+row counts per stage, add them as `Server-Timing` header to the response and log them as structured log record.
+"""
+
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_current_profiler = ContextVar("dashboard_profiler", default=None)
+
+
+@dataclass
+class Stage:
+    """Measurements of a single request stage"""
+
+    name: str
+    duration: float = 0.0
+    queries: int = 0
+    rows: int | None = None
+
+    def server_timing(self) -> str:
+        description = f"queries={self.queries}" if self.rows is None else f"queries={self.queries} rows={self.rows}"
+        return f'{self.name};dur={self.duration * 1000:.1f};desc="{description}"'
+
+
+class Profiler:
+    """Collects stages of a request"""
+
+    def __init__(self):
+        self.stages: list[Stage] = []
+        self.queries = 0
+
+    def count_query(self, execute, sql, params, many, context):
+        """DB execute wrapper counting queries"""
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def stage(self, name: str):
+        record = Stage(name)
+        queries_before = self.queries
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - start
+            record.queries = self.queries - queries_before
+            self.stages.append(record)
+
+    def server_timing(self) -> str:
+        return ", ".join(stage.server_timing() for stage in self.stages)
+
+    def log(self, request):
+        logger.info(
+            f"Profiled request '{request.path}'",
+            extra={
+                "path": request.path,
+                "queries": self.queries,
+                "stages": [asdict(stage) for stage in self.stages],
+            },
+        )
+
+
+def stage(name: str):
+    """
+    Measure stage within currently profiled request
+
+    Does nothing (except from yielding an unused stage) if current request is not profiled.
+    Row count can be set on yielded stage, i.e.:
+
+        with profiling.stage("fetch") as fetch_stage:
+            df = get_data()
+            fetch_stage.rows = len(df)
+    """
+    profiler = _current_profiler.get()
+    if profiler is None:
+        return nullcontext(Stage(name))
+    return profiler.stage(name)
+
+
+def profile(view):
+    """Profile view, if setting `DASHBOARD_PROFILING` is active"""
+
+    @wraps(view)
+    def profiled_view(request, *args, **kwargs):
+        if not settings.DASHBOARD_PROFILING:
+            return view(request, *args, **kwargs)
+        profiler = Profiler()
+        token = _current_profiler.set(profiler)
+        try:
+            with connection.execute_wrapper(profiler.count_query), profiler.stage("total"):
+                response = view(request, *args, **kwargs)
+        finally:
+            _current_profiler.reset(token)
+        response["Server-Timing"] = profiler.server_timing()
+        profiler.log(request)
+        return response
+
+    return profiled_view
@@ -0,0 +1,208 @@
+"""
+Rendering of chart figures in separate processes
+
+Building plotly figures is pure CPU work holding the GIL. If setting `DASHBOARD_RENDER_PROCESSES` is set, figures
+are built in a pool of render processes instead of the request thread:
+processed data is sent in compact form (string columns as categoricals), options are sent as `ChartOptions` and
+figures are returned as plotly JSON. Jobs are limited in time (`DASHBOARD_RENDER_TIMEOUT`) and render processes are
+limited in memory (`DASHBOARD_RENDER_MEMORY_LIMIT`).
+"""
+
+import json
+import multiprocessing
+import pickle
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import pandas as pd
+from django.conf import settings
+from plotly import graph_objects as go
+from plotly import io as pio
+
+from .lazy import lazy_import
+
+# Render processes unpickle jobs before Django is set up, thus modules depending on models are loaded on first use
+graphs = lazy_import("django_comparison_dashboard.graphs")
+
+CHART_CONFIG = {"toImageButtonOptions": {"format": "svg"}}
+
+# Additional time to wait for results of render processes, before giving up on a job
+TIMEOUT_GRACE_PERIOD = 5
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class RenderingError(Exception):
+    """Thrown if figure could not be rendered in render process"""
+
+
+@dataclass
+class ChartOptions:
+    """Picklable snapshot of graph filter set options, as used by chart functions"""
+
+    plot_options: dict
+    display_options: dict
+    cleaned_data: dict
+
+    @classmethod
+    def from_filter_set(cls, filter_set: "graphs.PlotFilterSet") -> "ChartOptions":
+        return cls(filter_set.plot_options, filter_set.display_options, filter_set.cleaned_data)
+
+
+def encode_frame(data: pd.DataFrame) -> bytes:
+    """
+    Serialize data compactly for sending it to render processes
+
+    String columns are converted into categoricals, thus repeated strings are sent only once.
+    Numeric columns are pickled as raw buffers.
+    """
+    string_columns = [
+        column
+        for column in data.columns
+        if data[column].dtype == object and pd.api.types.infer_dtype(data[column], skipna=True) == "string"
+    ]
+    data = data.astype({column: "category" for column in string_columns})
+    return pickle.dumps((data, string_columns), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_frame(payload: bytes) -> pd.DataFrame:
+    """Deserialize data encoded via `encode_frame`, restoring string columns"""
+    data, string_columns = pickle.loads(payload)
+    return data.astype({column: object for column in string_columns})
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return pool of render processes, which is created on first use"""
+    global _pool  # pylint:disable=W0603
+    with _pool_lock:
+        if _pool is None:
+            # Processes are spawned instead of forked, as forking a threaded server process is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.DASHBOARD_RENDER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_render_process,
+                initargs=(settings.SETTINGS_MODULE, settings.DASHBOARD_RENDER_MEMORY_LIMIT),
+            )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Shut down pool of render processes, pool is recreated on next render job"""
+    global _pool  # pylint:disable=W0603
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _init_render_process(settings_module: str | None, memory_limit: int | None) -> None:
+    import os
+
+    import django
+
+    # Settings module of server process is set explicitly, as it might not be given via environment (i.e. --settings)
+    if settings_module:
+        os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    django.setup()
+    if memory_limit:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+@contextmanager
+def _time_limit(seconds: float):
+    """Interrupt job in render process after given seconds (render jobs run in main thread of render process)"""
+
+    def raise_timeout(signum, frame):
+        raise RenderingError(f"Rendering took longer than {seconds}s.")
+
+    previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def render_figure_json(chart_type: str, payload: bytes, options: ChartOptions, timeout: float) -> str:
+    """
+    Build figure and return it as plotly JSON (run within render process)
+
+    Parameters
+    ----------
+    chart_type: str
+        Chart type as found in `graphs.CHART_DATA`
+    payload: bytes
+        Data encoded via `encode_frame`
+    options: ChartOptions
+        Options of graph filter set
+    timeout: float
+        Maximum time in seconds to build figure
+
+    Returns
+    -------
+    str
+        Figure as plotly JSON
+    """
+    with _time_limit(timeout):
+        data = decode_frame(payload)
+        figure = graphs.CHART_DATA[chart_type]["chart_function"](data, options)
+        return figure.to_json()
+
+
+def render_figure(chart_type: str, data: pd.DataFrame, filter_set: "graphs.PlotFilterSet") -> go.Figure | dict:
+    """
+    Build figure for given chart type, data and graph filter set
+
+    Figure is built in a render process if setting `DASHBOARD_RENDER_PROCESSES` is set, otherwise within current
+    thread.
+
+    Parameters
+    ----------
+    chart_type: str
+        Chart type as found in `graphs.CHART_DATA`
+    data: pd.DataFrame
+        Processed data to plot
+    filter_set: graphs.PlotFilterSet
+        Validated graph filter set
+
+    Returns
+    -------
+    go.Figure | dict
+        Figure, or figure as dict if built in render process
+
+    Raises
+    ------
+    RenderingError
+        if render process exceeded time or memory limit
+    """
+    if not settings.DASHBOARD_RENDER_PROCESSES:
+        return graphs.CHART_DATA[chart_type]["chart_function"](data, filter_set)
+    timeout = settings.DASHBOARD_RENDER_TIMEOUT
+    future = get_pool().submit(
+        render_figure_json, chart_type, encode_frame(data), ChartOptions.from_filter_set(filter_set), timeout
+    )
+    try:
+        figure_json = future.result(timeout=timeout + TIMEOUT_GRACE_PERIOD)
+    except FutureTimeoutError as error:
+        raise RenderingError(f"Rendering took longer than {timeout}s.") from error
+    except BrokenProcessPool as error:
+        # A render process died (i.e. killed by OOM killer), thus pool is replaced
+        shutdown_pool()
+        raise RenderingError("Render process died unexpectedly.") from error
+    except MemoryError as error:
+        raise RenderingError("Rendering exceeded memory limit.") from error
+    return json.loads(figure_json)
+
+
+def figure_to_html(figure: go.Figure | dict) -> str:
+    """Render figure (or figure dict returned from render process) as HTML"""
+    return pio.to_html(figure, config=CHART_CONFIG, validate=False)
@@ -0,0 +1,85 @@
+"""
+Pre-aggregated rollups of scalar data
+
+For every dimension set configured in setting `DASHBOARD_ROLLUP_DIMENSIONS`, scalar data of a result is summed up by
+these dimensions (and unit) at import and stored as `RollupData`.
+Grouped data requests are answered from the smallest rollup holding all group-by and filtered dimensions.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, QuerySet, Sum
+
+from .forms import DataFilterSet
+from .models import Result, Rollup, RollupData, ScalarData
+
+
+def get_dimension_sets() -> list[tuple[str, ...]]:
+    """Return configured dimension sets, dimensions are sorted to get a unique key per set"""
+    return [tuple(sorted(set(dimensions))) for dimensions in settings.DASHBOARD_ROLLUP_DIMENSIONS]
+
+
+def get_dimensions_key(dimensions: tuple[str, ...]) -> str:
+    return ",".join(dimensions)
+
+
+@transaction.atomic
+def build_rollups(result: Result) -> None:
+    """(Re)build all configured rollups for given result"""
+    result.rollups.all().delete()
+    for dimensions in get_dimension_sets():
+        aggregated = (
+            ScalarData.objects.filter(result=result)
+            .values(*dimensions, "unit")
+            .annotate(value=Sum("value"))
+            .order_by()
+        )
+        rollup_data = [RollupData(**item) for item in aggregated]
+        rollup = Rollup.objects.create(
+            result=result, dimensions=get_dimensions_key(dimensions), row_count=len(rollup_data)
+        )
+        for item in rollup_data:
+            item.rollup = rollup
+        RollupData.objects.bulk_create(rollup_data, batch_size=10_000)
+        logging.info(f"Built rollup by {dimensions} for result '{result.name}' ({len(rollup_data)} rows).")
+
+
+def get_rollup_queryset(filter_set: DataFilterSet) -> QuerySet | None:
+    """
+    Return filtered rollup data for smallest rollup covering given filter set
+
+    A rollup can be used if it holds all group-by dimensions and all dimensions which are filtered.
+    Additionally, rollup must be present for all selected results.
+
+    Returns
+    -------
+    QuerySet | None
+        Filtered rollup data or None if no rollup matches filter set
+    """
+    if not filter_set.group_by:
+        return None
+    scenario_filter = filter_set.bound_forms["scenario_filter"]
+    filtered = {name for name, value in scenario_filter.form.cleaned_data.items() if value}
+    required = set(filter_set.group_by) | filtered
+    candidates = [
+        get_dimensions_key(dimensions) for dimensions in get_dimension_sets() if required.issubset(dimensions)
+    ]
+    if not candidates:
+        return None
+
+    selected_results = set(map(int, filter_set.selected_scenarios))
+    rollups = (
+        Rollup.objects.filter(result__in=selected_results, dimensions__in=candidates)
+        .values("dimensions")
+        .annotate(results=Count("result"), rows=Sum("row_count"))
+        .filter(results=len(selected_results))
+        .order_by("rows")
+    )
+    smallest = rollups.first()
+    if smallest is None:
+        return None
+    return scenario_filter.filter_queryset(
+        RollupData.objects.filter(rollup__result__in=selected_results, rollup__dimensions=smallest["dimensions"])
+    )
@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import pathlib
@@ -24,10 +25,31 @@ class DataType(IntEnum):
 
 
 COLUMN_JOINER = "-"
+ARRAY_JOINER = "/"
 
-with DATAPACKAGE_PATH.open("r", encoding="UTF-8") as datapackage_file:
-    datapackage = json.loads(datapackage_file.read())
-    MODEX_OUTPUT_SCHEMA = {resource["name"]: resource["schema"] for resource in datapackage["resources"]}
+
+@functools.cache
+def load_modex_output_schema() -> dict:
+    with DATAPACKAGE_PATH.open("r", encoding="UTF-8") as datapackage_file:
+        datapackage = json.loads(datapackage_file.read())
+    return {resource["name"]: resource["schema"] for resource in datapackage["resources"]}
+
+
+@functools.cache
+def load_color_dict() -> dict:
+    if os.path.exists(COLOR_DICT_PATH):
+        with open(COLOR_DICT_PATH, encoding="UTF-8") as color_file:
+            return json.load(color_file)
+    return {}
+
+
+def __getattr__(name):
+    """Load datapackage schema and color dict on first access"""
+    if name == "MODEX_OUTPUT_SCHEMA":
+        return load_modex_output_schema()
+    if name == "COLOR_DICT":
+        return load_color_dict()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # GRAPHS
@@ -63,10 +85,3 @@ GRAPHS_DEFAULT_YAXES_LAYOUT = {
     "tickfont": {"size": 14},
 }
 GRAPHS_DEFAULT_ANNOTATIONS_LAYOUT = {"font_size": 14}
-
-# Load the color dictionary from the JSON file
-if os.path.exists(COLOR_DICT_PATH):
-    with open(COLOR_DICT_PATH, encoding="UTF-8") as color_file:
-        COLOR_DICT = json.load(color_file)
-else:
-    COLOR_DICT = {}
@@ -1,14 +1,16 @@
 import abc
-import ast
 import logging
+import re
+from collections.abc import Iterator
 
+import numpy as np
 import pandas as pd
-import pandera
-import pandera.io
-from django.contrib.postgres.fields import ArrayField
+from django.db import transaction
+from django.db.models import CharField, F
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
-from django_comparison_dashboard import forms, models, settings
+from django_comparison_dashboard import executors, forms, models, rollups, settings, stats, timeseries
 
 
 class SourceRegistry:
@@ -32,6 +34,147 @@ class SourceRegistry:
         )
 
 
+# Pandas dtypes for field types of OEDatamodel schema; array fields are read as categories and parsed afterwards
+SCHEMA_DTYPES = {
+    "string": "category",
+    "integer": "Int64",
+    "number": "float64",
+    "boolean": "boolean",
+    "array": "category",
+}
+BOOLEAN_STRINGS = {"true": True, "false": False, "1": True, "0": False}
+ARRAY_ITEM = re.compile(r"\"([^\"]*)\"|'([^']*)'|([^,\s\"'][^,]*?)\s*(?=,|$)")
+
+
+def get_schema_fields(data_type: settings.DataType) -> dict[str, str]:
+    """Return field types by field name from OEDatamodel schema of given data type"""
+    return {field["name"]: field["type"] for field in settings.MODEX_OUTPUT_SCHEMA[str(data_type)]["fields"]}
+
+
+def read_csv(file, data_type: settings.DataType, **kwargs) -> pd.DataFrame:
+    """
+    Read CSV file into dataframe using dtypes derived from OEDatamodel schema
+
+    Parameters
+    ----------
+    file
+        File or buffer to read CSV from
+    data_type: settings.DataType
+        Data type whose schema is used
+    kwargs
+        Passed to `pandas.read_csv`
+
+    Returns
+    -------
+    pd.DataFrame
+        Typed data
+    """
+    dtypes = {
+        name: SCHEMA_DTYPES.get(field_type, "object") for name, field_type in get_schema_fields(data_type).items()
+    }
+    return coerce_dtypes(pd.read_csv(file, dtype=dtypes, **kwargs), data_type)
+
+
+def coerce_dtypes(data: pd.DataFrame, data_type: settings.DataType) -> pd.DataFrame:
+    """
+    Coerce columns of dataframe into dtypes derived from OEDatamodel schema
+
+    Columns already holding their target dtype are kept. Columns not in schema are left untouched.
+
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Data to coerce
+    data_type: settings.DataType
+        Data type whose schema is used
+
+    Returns
+    -------
+    pd.DataFrame
+        Typed data
+    """
+    for name, field_type in get_schema_fields(data_type).items():
+        if name not in data:
+            continue
+        column = data[name]
+        if field_type == "array":
+            data[name] = parse_array_column(column)
+        elif field_type == "datetime":
+            data[name] = pd.to_datetime(column, utc=True)
+        elif field_type == "boolean" and not pd.api.types.is_bool_dtype(column.dtype):
+            data[name] = column.astype("string").str.lower().map(BOOLEAN_STRINGS).astype("boolean")
+        elif field_type in SCHEMA_DTYPES:
+            data[name] = column.astype(SCHEMA_DTYPES[field_type])
+    return data
+
+
+def parse_array(raw_string: str) -> list[str]:
+    """
+    Parse list of strings from bracketed list syntax (i.e. '["a", 'b', c]')
+
+    Items may be quoted by double or single quotes or unquoted. Strings not enclosed in brackets result in an empty
+    list.
+    """
+    raw_string = raw_string.strip()
+    if not (raw_string.startswith("[") and raw_string.endswith("]")):
+        return []
+    return [double or single or bare for double, single, bare in ARRAY_ITEM.findall(raw_string[1:-1])]
+
+
+def parse_array_column(column: pd.Series) -> pd.Series:
+    """
+    Parse column of array field into column of lists
+
+    Strings are parsed once per distinct value, thus rows holding equal strings share the same list.
+    Lists are kept and missing values result in empty lists.
+
+    Parameters
+    ----------
+    column: pd.Series
+        Column holding bracketed list strings, lists or missing values
+
+    Returns
+    -------
+    pd.Series
+        Column holding lists
+    """
+    values = column.to_numpy(dtype=object)
+    is_string = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    is_list = np.fromiter((isinstance(value, list) for value in values), dtype=bool, count=len(values))
+    parsed = np.empty(len(values), dtype=object)
+
+    codes, distinct_strings = pd.factorize(values[is_string])
+    distinct_parsed = np.empty(len(distinct_strings), dtype=object)
+    distinct_parsed[:] = [parse_array(raw_string) for raw_string in distinct_strings]
+    parsed[is_string] = distinct_parsed[codes]
+    parsed[is_list] = values[is_list]
+    for index in np.flatnonzero(~(is_string | is_list)):
+        parsed[index] = []
+    return pd.Series(parsed, index=column.index, dtype=object)
+
+
+def get_data_model(data_type: settings.DataType) -> type[models.ScalarData | models.TimeseriesData]:
+    """Return model data of given data type is stored in"""
+    if data_type == settings.DataType.Scalar:
+        return models.ScalarData
+    if data_type == settings.DataType.Timeseries:
+        return models.TimeseriesData
+    raise TypeError(f"Unknown data type '{data_type}'.")
+
+
+def get_required_fields(data_model: type[models.ScalarData | models.TimeseriesData]) -> tuple[list[str], list[str]]:
+    """
+    Return non-nullable string fields and other non-nullable fields of data model
+
+    Missing values of non-nullable string fields are stored as empty strings, whereas missing values of other
+    non-nullable fields cannot be stored at all.
+    """
+    fields = [field for field in data_model._meta.concrete_fields if not field.null and not field.primary_key]
+    string_fields = [field.attname for field in fields if isinstance(field, CharField)]
+    other_fields = [field.attname for field in fields if not isinstance(field, CharField) and not field.is_relation]
+    return string_fields, other_fields
+
+
 class ScenarioValidationError(Exception):
     """Raised if scenario is not valid"""
 
@@ -60,14 +203,22 @@ class Scenario(abc.ABC):
     def get(self) -> models.Result:
         return get_object_or_404(models.Result.objects.filter(name=str(self), source__name=self.source.name))
 
+    @transaction.atomic
     def download(self):
-        """Download scenario data, validate data and store in DB if data is valid"""
-        data = self.source.download_scenario(self)
-        self._validate(data)
-        self._store_in_db(data)
+        """
+        Download scenario data, validate data and store in DB if data is valid
+
+        Data is processed in chunks as delivered by source; if any chunk is invalid, nothing is stored.
+        """
+        result = None
+        for data in self.source.download_scenario_chunks(self):
+            self._validate(data)
+            result = self._store_in_db(data, build_aggregates=False)
+        if result is not None:
+            self._build_aggregates(result)
         logging.info(f"Successfully downloaded scenario '{self}'.")
 
-    def _store_in_db(self, data: pd.DataFrame):
+    def _store_in_db(self, data: pd.DataFrame, build_aggregates: bool = True) -> models.Result:
         """
         Store data into corresponding database model (scalar or timeseries)
 
@@ -75,31 +226,39 @@ class Scenario(abc.ABC):
         ----------
         data: dict | pd.DataFrame
             Iterable data which shall be stored in DB
-        """
-
-        def parse_array(raw_string):
-            """Tries to parse lists from array fields"""
-            if raw_string is None:
-                return []
-            try:
-                return ast.literal_eval(raw_string)
-            except SyntaxError:
-                return []
+        build_aggregates: bool
+            If set, rollups and statistics of result are (re)built after storing data
 
+        Returns
+        -------
+        models.Result
+            Result data has been stored for
+        """
+        data = coerce_dtypes(data, self.data_type)
         source = models.Source.objects.get_or_create(name=self.source.name)[0]
         result = models.Result.objects.get_or_create(name=str(self), source=source)[0]
+        data_model = get_data_model(self.data_type)
+        if data_model is models.TimeseriesData:
+            data = timeseries.prepare_timeseries_data(data)
+
+        # Missing values are stored as NULL, except for non-nullable string fields which hold empty strings instead
+        data = data.astype(object).where(data.notna(), None)
+        string_fields = [name for name in get_required_fields(data_model)[0] if name in data]
+        data[string_fields] = data[string_fields].fillna("")
+        records = data.to_dict(orient="records")
+        data_model.objects.bulk_create(data_model(result=result, **item) for item in records)
+        models.Result.objects.filter(pk=result.pk).update(
+            row_count=F("row_count") + len(records), imported_at=timezone.now()
+        )
+        if build_aggregates:
+            self._build_aggregates(result)
+        return result
+
+    def _build_aggregates(self, result: models.Result) -> None:
+        """(Re)build rollups (scalar data only) and statistics of result"""
         if self.data_type == settings.DataType.Scalar:
-            data_model = models.ScalarData
-        elif self.data_type == models.TimeseriesData:
-            data_model = models.TimeseriesData
-        else:
-            raise TypeError(f"Unknown data type '{self.data_type}'.")
-
-        # Convert data for array fields into list:
-        for field in data_model._meta.fields:
-            if isinstance(field, ArrayField):
-                data[field.column] = data[field.column].apply(parse_array)
-        data_model.objects.bulk_create(data_model(result=result, **item) for item in data.to_dict(orient="records"))
+            rollups.build_rollups(result)
+        stats.build_statistics(result)
 
     def _validate(self, data: pd.DataFrame) -> None:
         """
@@ -121,7 +280,14 @@ class Scenario(abc.ABC):
             if scenario data does not fit into OEDatamodel format
         """
         logging.info(f"Validating data for scenario {self}...")
+        import pandera.io
+
         schema = pandera.io.from_frictionless_schema(settings.MODEX_OUTPUT_SCHEMA[str(self.data_type)])
+        # Missing values of non-nullable non-string fields cannot be stored (see `_store_in_db`)
+        required_fields = get_required_fields(get_data_model(self.data_type))[1]
+        schema = schema.update_columns(
+            {name: {"nullable": False} for name in required_fields if name in schema.columns}
+        )
         schema.validate(data, lazy=True)
 
 
@@ -142,6 +308,21 @@ class DataSource(abc.ABC):
         """
         raise NotImplementedError
 
+    @classmethod
+    async def alist_scenarios(cls) -> list[Scenario]:
+        """
+        List all available scenarios without blocking the event loop
+
+        By default, `list_scenarios` is run in bounded executor. Sources able to query their scenarios via async HTTP
+        client should override this method.
+
+        Returns
+        -------
+        list[Scenario]
+            List of available scenarios
+        """
+        return await executors.run_in_executor(cls.list_scenarios)
+
     @classmethod
     @abc.abstractmethod
     def download_scenario(cls, scenario: Scenario) -> pd.DataFrame:
@@ -159,3 +340,23 @@ class DataSource(abc.ABC):
             DataFrame containing scenario data
         """
         raise NotImplementedError
+
+    @classmethod
+    def download_scenario_chunks(cls, scenario: Scenario) -> Iterator[pd.DataFrame]:
+        """
+        Download scenario from source in chunks
+
+        By default, scenario is downloaded at once. Sources able to stream their data should override this method
+        to keep memory bounded.
+
+        Parameters
+        ----------
+        scenario: Scenario
+            Download given scenario from source
+
+        Yields
+        ------
+        pd.DataFrame
+            DataFrame containing chunk of scenario data
+        """
+        yield cls.download_scenario(scenario)
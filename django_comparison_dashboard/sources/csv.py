@@ -1,4 +1,3 @@
-import csv
 from io import TextIOWrapper
 
 import pandas as pd
@@ -38,5 +37,4 @@ class CSVDataSource(core.DataSource):
             if not isinstance(scenario.csv_file, TextIOWrapper)
             else scenario.csv_file
         )
-        csv_reader = csv.DictReader(csv_text, delimiter=";")
-        return pd.DataFrame([row for row in csv_reader])
+        return core.read_csv(csv_text, scenario.data_type, sep=";")
@@ -1,10 +1,14 @@
 import logging
-import math
 from io import BytesIO
 
 import pandas as pd
 import requests
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 from django_comparison_dashboard import forms, settings
 from django_comparison_dashboard.sources import core
 
@@ -28,6 +32,13 @@ class DatabusDataSource(core.DataSource):
     def list_scenarios(cls) -> list[core.Scenario]:
         return [DatabusScenario(artifact) for artifact in get_artifacts_from_collection()]
 
+    @classmethod
+    async def alist_scenarios(cls) -> list[core.Scenario]:
+        """List scenarios via async HTTP client, if httpx is installed"""
+        if httpx is None:
+            return await super().alist_scenarios()
+        return [DatabusScenario(artifact) for artifact in await aget_artifacts_from_collection()]
+
     @classmethod
     def download_scenario(cls, scenario: DatabusScenario) -> pd.DataFrame:
         """
@@ -47,9 +58,8 @@ class DatabusDataSource(core.DataSource):
         data_url = [f for f in filenames if f.endswith(".csv")][0]
         csv_bytes = download_artifact(data_url)
         csv_buffer = BytesIO(csv_bytes)
-        df = pd.read_csv(csv_buffer)
+        df = core.read_csv(csv_buffer, scenario.data_type)
         df.drop("id", inplace=True, axis=1)
-        df.replace(math.nan, None, inplace=True)
         return df
 
 
@@ -77,6 +87,27 @@ def query_sparql(query: str) -> dict:
     return data["results"]["bindings"]
 
 
+async def aquery_sparql(client: "httpx.AsyncClient", query: str) -> dict:
+    """Query SPARQL endpoint using async HTTP client and return data as dict (see `query_sparql`)"""
+    response = await client.post(
+        DATABUS_ENDPOINT,
+        headers={"Accept": "application/json, text/plain, */*", "Content-Type": "application/x-www-form-urlencoded"},
+        data={"query": query},
+    )
+    data = response.json()
+    return data["results"]["bindings"]
+
+
+def extract_artifacts(files: list[dict]) -> list[str]:
+    """Returns distinct artifacts of files given as SPARQL bindings"""
+
+    def extract_artifact_from_uri(uri: str):
+        https, _, host, user, group, artifact, version, name = uri.split("/")
+        return "/".join((https, _, host, user, group, artifact))
+
+    return list({extract_artifact_from_uri(file["file"]["value"]) for file in files})
+
+
 def get_artifacts_from_collection() -> list[str]:
     """Returns list of all artifacts found in given collection.
 
@@ -85,15 +116,17 @@ def get_artifacts_from_collection() -> list[str]:
     List[str]
         List of artifacts in collection
     """
-
-    def extract_artifact_from_uri(uri: str):
-        https, _, host, user, group, artifact, version, name = uri.split("/")
-        return "/".join((https, _, host, user, group, artifact))
-
     response = requests.get(DATABUS_COLLECTION_URL, headers={"Accept": "text/sparql"}, timeout=90)
     result = query_sparql(response.text)
-    files = {extract_artifact_from_uri(file["file"]["value"]) for file in result}
-    return list(files)
+    return extract_artifacts(result)
+
+
+async def aget_artifacts_from_collection() -> list[str]:
+    """Returns list of all artifacts found in given collection using async HTTP client"""
+    async with httpx.AsyncClient(timeout=90) as client:
+        response = await client.get(DATABUS_COLLECTION_URL, headers={"Accept": "text/sparql"})
+        result = await aquery_sparql(client, response.text)
+    return extract_artifacts(result)
 
 
 def get_latest_version_of_artifact(artifact: str) -> str:
@@ -1,6 +1,11 @@
+import codecs
+import itertools
 import json
 import logging
+import re
+from collections.abc import Iterable, Iterator
 
+import pandas as pd
 import requests
 
 from django_comparison_dashboard import settings
@@ -9,6 +14,11 @@ from django_comparison_dashboard.sources import core
 OEP_URL = "https://openenergyplatform.org"
 CONNECTOR_URL = "https://modex.rl-institut.de/scenario/id/"
 
+CHUNK_SIZE = 10_000  # Rows per chunk passed to import
+RESPONSE_CHUNK_SIZE = 2**16  # Bytes read from response at once
+MARKER_TAIL = 64
+SEPARATOR = re.compile(r"[\s,]*")
+
 
 class ModexScenario(core.Scenario):
     source_name = "MODEX"
@@ -43,7 +53,7 @@ class ModexDataSource(core.DataSource):
         ]
 
     @classmethod
-    def download_scenario(cls, scenario: ModexScenario) -> list[dict]:
+    def download_scenario(cls, scenario: ModexScenario) -> pd.DataFrame:
         """
         Download scenario data from OEDatamodel_API using table name and scenario ID
 
@@ -52,6 +62,20 @@ class ModexDataSource(core.DataSource):
         pd.DataFrame
             holding scenario data
         """
+        return pd.concat(cls.download_scenario_chunks(scenario), ignore_index=True)
+
+    @classmethod
+    def download_scenario_chunks(cls, scenario: ModexScenario) -> Iterator[pd.DataFrame]:
+        """
+        Stream scenario data from OEDatamodel_API using table name and scenario ID
+
+        Response is parsed incrementally, thus neither the raw response nor all parsed rows are held in memory.
+
+        Yields
+        ------
+        pd.DataFrame
+            holding up to CHUNK_SIZE rows of scenario data
+        """
         logging.info(f"Requesting data for scenario '{scenario}' (Source: {cls.name})...")
         table = str(scenario.data_type)
         response = requests.get(
@@ -69,7 +93,65 @@ class ModexDataSource(core.DataSource):
             },
             timeout=10000,
             verify=False,
+            stream=True,
         )
         logging.info(f"Loading data for scenario {scenario}...")
-        data = json.loads(response.text)
-        return [{k: v for k, v in d.items() if k not in ("id", "scenario_id")} for d in data[table]]
+        with response:
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+            text_chunks = (decoder.decode(chunk) for chunk in response.iter_content(chunk_size=RESPONSE_CHUNK_SIZE))
+            rows = (
+                {k: v for k, v in row.items() if k not in ("id", "scenario_id")}
+                for row in iter_json_array(text_chunks, table)
+            )
+            while chunk := list(itertools.islice(rows, CHUNK_SIZE)):
+                yield core.coerce_dtypes(pd.DataFrame(chunk), scenario.data_type)
+
+
+def iter_json_array(text_chunks: Iterable[str], key: str) -> Iterator:
+    """
+    Parse items of JSON array stored under given key incrementally from text chunks
+
+    Only the first occurrence of key is taken into account, surrounding JSON is not validated.
+
+    Parameters
+    ----------
+    text_chunks: Iterable[str]
+        Chunks of JSON text
+    key: str
+        Key of array to parse items from
+
+    Yields
+    ------
+    Any
+        Parsed array item
+    """
+    text_chunks = iter(text_chunks)
+    marker = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+    buffer = ""
+    for chunk in text_chunks:
+        buffer += chunk
+        match = marker.search(buffer)
+        if match:
+            buffer = buffer[match.end() :]
+            break
+        # Keep tail in case marker is split between chunks
+        buffer = buffer[-(len(key) + MARKER_TAIL) :]
+    else:
+        raise ValueError(f"Array '{key}' not found in response.")
+
+    decoder = json.JSONDecoder()
+    position = 0
+    while True:
+        position = SEPARATOR.match(buffer, position).end()
+        if buffer.startswith("]", position):
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = next(text_chunks, None)
+            if chunk is None:
+                raise
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield item
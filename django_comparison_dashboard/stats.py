@@ -0,0 +1,35 @@
+"""
+Per-result statistics
+
+Statistics are computed by a single aggregation query whenever data of a result is imported, thus pages, query
+planning and cache sizing can use them without scanning the data tables.
+"""
+
+import logging
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count, Max, Min
+
+from .models import Result, ResultStatistics, ScalarData, TimeseriesData
+
+
+def build_statistics(result: Result) -> ResultStatistics:
+    """(Re)build statistics for given result from its scalar or timeseries data"""
+    if result.scalars.exists():
+        data, aggregates = result.scalars, {"value_min": Min("value"), "value_max": Max("value")}
+    else:
+        data, aggregates = result.timeseries, {}
+    filters = ScalarData.filters if data.model is ScalarData else TimeseriesData.filters
+    statistics = data.aggregate(
+        year_min=Min("year"),
+        year_max=Max("year"),
+        units=ArrayAgg("unit", distinct=True, ordering="unit", default=[]),
+        **aggregates,
+        **{f"distinct_{column}": Count(column, distinct=True) for column in filters},
+    )
+    distinct_counts = {column: statistics.pop(f"distinct_{column}") for column in filters}
+    result_statistics, _ = ResultStatistics.objects.update_or_create(
+        result=result, defaults=statistics | {"distinct_counts": distinct_counts}
+    )
+    logging.info(f"Built statistics for result '{result.name}'.")
+    return result_statistics
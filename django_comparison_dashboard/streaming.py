@@ -0,0 +1,168 @@
+"""
+Serialization of data chunks into streamable formats
+
+Chunks of data (see `preprocessing.iter_scalar_data`) are serialized one by one, thus responses can be streamed
+without holding the whole data in memory.
+Arrow IPC and Parquet need package `pyarrow` to be installed; both are written in record batches (one per chunk).
+"""
+
+import importlib.util
+import io
+from collections.abc import Iterable, Iterator
+
+import pandas as pd
+from django.db.models import Model
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+FILE_EXTENSIONS = {"ndjson": "ndjson", "csv": "csv", "arrow": "arrows", "parquet": "parquet"}
+# Formats offered for data download in dashboard
+DOWNLOAD_FORMATS = {"csv": "CSV", "parquet": "Parquet", "arrow": "Arrow IPC"}
+ARROW_FORMATS = ("arrow", "parquet")
+
+# Arrow types per internal type of model field, other fields (and joined array fields) are sent as strings
+ARROW_TYPES = {
+    "BigAutoField": "int64",
+    "AutoField": "int64",
+    "ForeignKey": "int64",
+    "IntegerField": "int64",
+    "FloatField": "float64",
+    "BooleanField": "bool_",
+}
+
+
+class StreamingError(Exception):
+    """Thrown if data cannot be serialized into requested format"""
+
+
+class ChunkSink(io.RawIOBase):
+    """Writable file object collecting written bytes until they are taken, thus writers can be streamed"""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        """Return bytes written since last call"""
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def is_available(stream_format: str) -> bool:
+    """Return if given format can be streamed (Arrow IPC and Parquet need package pyarrow)"""
+    if stream_format in ARROW_FORMATS:
+        return importlib.util.find_spec("pyarrow") is not None
+    return stream_format in STREAM_FORMATS
+
+
+def split_frame(df: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Split dataframe into chunks of given size"""
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start : start + chunk_size]
+
+
+def stream_ndjson(chunks: Iterable[pd.DataFrame], columns: list[str]) -> Iterator[bytes]:
+    """Serialize chunks as newline delimited JSON (one object per row, missing values as null)"""
+    for chunk in chunks:
+        if not chunk.empty:
+            yield chunk.to_json(orient="records", lines=True, date_format="iso").rstrip("\n").encode("utf-8") + b"\n"
+
+
+def stream_csv(chunks: Iterable[pd.DataFrame], columns: list[str]) -> Iterator[bytes]:
+    """Serialize chunks as CSV, header is sent upfront"""
+    yield pd.DataFrame(columns=columns).to_csv(index=False).encode("utf-8")
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=False).encode("utf-8")
+
+
+def get_arrow_schema(model: type[Model], columns: list[str]):
+    """Return Arrow schema for given columns derived from model fields"""
+    import pyarrow as pa
+
+    internal_types = {field.attname: field.get_internal_type() for field in model._meta.concrete_fields}
+    arrow_types = {column: ARROW_TYPES.get(internal_types.get(column), "string") for column in columns}
+    return pa.schema([(column, getattr(pa, arrow_type)()) for column, arrow_type in arrow_types.items()])
+
+
+def stream_arrow(chunks: Iterable[pd.DataFrame], columns: list[str], model: type[Model]) -> Iterator[bytes]:
+    """Serialize chunks as Arrow IPC stream, one record batch per chunk"""
+    import pyarrow as pa
+
+    schema = get_arrow_schema(model, columns)
+    sink = ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for chunk in chunks:
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.take()
+    # Remaining bytes hold schema (if no chunk was written) and end-of-stream marker
+    yield sink.take()
+
+
+def stream_parquet(chunks: Iterable[pd.DataFrame], columns: list[str], model: type[Model]) -> Iterator[bytes]:
+    """Serialize chunks as Parquet file, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = get_arrow_schema(model, columns)
+    sink = ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.take()
+    # Remaining bytes hold file footer
+    yield sink.take()
+
+
+def stream_chunks(
+    chunks: Iterable[pd.DataFrame], columns: list[str], stream_format: str, model: type[Model]
+) -> Iterator[bytes]:
+    """
+    Serialize chunks of data into given format
+
+    Parameters
+    ----------
+    chunks: Iterable[pd.DataFrame]
+        Chunks of data holding given columns
+    columns: list[str]
+        Columns of data
+    stream_format: str
+        One of STREAM_FORMATS
+    model: type[Model]
+        Model data stems from, used to derive Arrow types
+
+    Returns
+    -------
+    Iterator[bytes]
+        Serialized data
+
+    Raises
+    ------
+    StreamingError
+        if format is unknown or not available
+    """
+    if not is_available(stream_format):
+        raise StreamingError(f"Format '{stream_format}' is not available.")
+    if stream_format == "arrow":
+        return stream_arrow(chunks, columns, model)
+    if stream_format == "parquet":
+        return stream_parquet(chunks, columns, model)
+    if stream_format == "csv":
+        return stream_csv(chunks, columns)
+    return stream_ndjson(chunks, columns)
@@ -0,0 +1,196 @@
+"""
+Compact storage of timeseries
+
+Series are stored as zlib-compressed little-endian float64 bytes (see `TimeseriesData.series`).
+Decoding is done via `numpy.frombuffer`, thus series are never converted into python lists.
+"""
+
+import json
+import zlib
+
+import numpy as np
+import pandas as pd
+from django.db.models import DateTimeField, ExpressionWrapper, F, QuerySet
+
+SERIES_DTYPE = np.dtype("<f8")
+TIMEINDEX_COLUMNS = ["timeindex_start", "timeindex_resolution", "length"]
+
+RESAMPLING_PERIODS = {"day": "D", "week": "W", "month": "M"}
+RESAMPLING_METHODS = ("sum", "mean", "max", "min")
+
+
+def encode_series(values) -> bytes:
+    """Encode series values into compressed float64 bytes"""
+    return zlib.compress(np.asarray(values, dtype=SERIES_DTYPE).tobytes())
+
+
+def decode_series(data: bytes | memoryview) -> np.ndarray:
+    """Decode compressed float64 bytes into numpy array"""
+    return np.frombuffer(zlib.decompress(data), dtype=SERIES_DTYPE)
+
+
+def decode_series_column(column: pd.Series) -> pd.Series:
+    """
+    Decode column of encoded series into column of numpy arrays
+
+    All series are decompressed into one buffer and decoded at once; resulting arrays are views on this buffer.
+
+    Parameters
+    ----------
+    column: pd.Series
+        Column holding encoded series
+
+    Returns
+    -------
+    pd.Series
+        Column holding series as numpy arrays
+    """
+    buffers = [zlib.decompress(data) for data in column]
+    values = np.frombuffer(b"".join(buffers), dtype=SERIES_DTYPE)
+    offsets = np.cumsum([len(buffer) // SERIES_DTYPE.itemsize for buffer in buffers])[:-1]
+    return pd.Series(np.split(values, offsets), index=column.index, dtype=object)
+
+
+def parse_resolution(resolution: str | pd.Timedelta) -> pd.Timedelta:
+    """Parse timeindex resolution given as frequency string (i.e. "1h", "15min") or timedelta"""
+    if isinstance(resolution, pd.Timedelta):
+        return resolution
+    return pd.Timedelta(pd.tseries.frequencies.to_offset(resolution))
+
+
+def prepare_timeseries_data(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepare timeseries data (in OEDatamodel format) for storing as `TimeseriesData`
+
+    Series are encoded, timeindex is reduced to start (naive timestamps are taken as UTC), resolution and length of
+    series.
+
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Timeseries data, series may be given as lists or as JSON strings
+
+    Returns
+    -------
+    pd.DataFrame
+        Data ready to be stored in DB
+    """
+    series = data["series"].map(lambda raw: json.loads(raw) if isinstance(raw, str) else raw)
+    data = data.drop(columns=["series", "timeindex_stop"], errors="ignore")
+    data["timeindex_start"] = pd.to_datetime(data["timeindex_start"], utc=True)
+    data["timeindex_resolution"] = data["timeindex_resolution"].map(parse_resolution)
+    data["length"] = series.map(len)
+    data["series"] = series.map(encode_series)
+    return data
+
+
+def filter_window(queryset: QuerySet, start: pd.Timestamp | None = None, end: pd.Timestamp | None = None) -> QuerySet:
+    """Exclude timeseries which do not overlap with given time window (within DB)"""
+    if start is not None:
+        queryset = queryset.annotate(
+            timeindex_stop=ExpressionWrapper(
+                F("timeindex_start") + F("timeindex_resolution") * (F("length") - 1), output_field=DateTimeField()
+            )
+        ).filter(timeindex_stop__gte=start)
+    if end is not None:
+        queryset = queryset.filter(timeindex_start__lte=end)
+    return queryset
+
+
+def window_and_resample(
+    df: pd.DataFrame,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    period: str | None = None,
+    method: str = "sum",
+) -> pd.DataFrame:
+    """
+    Cut series to given time window and resample them to given period
+
+    Series sharing the same timeindex are stacked into a matrix and processed at once.
+    Timeindex columns (start, resolution, length) are replaced by column "timeindex" holding the resulting timestamps.
+    Series without values in given time window are dropped.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Timeseries data holding decoded series and timeindex columns
+    start: pd.Timestamp | None
+        Start of time window (inclusive)
+    end: pd.Timestamp | None
+        End of time window (inclusive)
+    period: str | None
+        Period to resample series to, one of RESAMPLING_PERIODS
+    method: str
+        Method to aggregate values within period, one of RESAMPLING_METHODS
+
+    Returns
+    -------
+    pd.DataFrame
+        Timeseries data holding windowed and resampled series and related timeindex
+    """
+    if period is not None and period not in RESAMPLING_PERIODS:
+        raise ValueError(f"Unknown resampling period '{period}'.")
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(f"Unknown resampling method '{method}'.")
+    parts = []
+    for (timeindex_start, resolution, length), group in df.groupby(TIMEINDEX_COLUMNS, sort=False):
+        timeindex = pd.date_range(timeindex_start, periods=length, freq=resolution)
+        window = slice(
+            0 if start is None else timeindex.searchsorted(start),
+            length if end is None else timeindex.searchsorted(end, side="right"),
+        )
+        timeindex = timeindex[window]
+        if timeindex.empty:
+            continue
+        matrix = np.stack(group["series"].to_numpy())[:, window]
+        if period is not None:
+            timeindex, matrix = resample_matrix(timeindex, matrix, RESAMPLING_PERIODS[period], method)
+        group = group.drop(columns=TIMEINDEX_COLUMNS)
+        group["series"] = list(matrix)
+        group["timeindex"] = [timeindex] * len(group)
+        parts.append(group)
+    if not parts:
+        return df.drop(columns=TIMEINDEX_COLUMNS).assign(timeindex=None).iloc[:0]
+    return pd.concat(parts).sort_index()
+
+
+def resample_matrix(
+    timeindex: pd.DatetimeIndex, matrix: np.ndarray, period: str, method: str
+) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """Resample series (rows of matrix) to given period using reduction of given method"""
+    periods = timeindex.tz_localize(None).to_period(period)
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    if method == "sum":
+        resampled = np.add.reduceat(matrix, starts, axis=1)
+    elif method == "mean":
+        resampled = np.add.reduceat(matrix, starts, axis=1) / np.diff(np.r_[starts, len(periods)])
+    elif method == "max":
+        resampled = np.maximum.reduceat(matrix, starts, axis=1)
+    else:
+        resampled = np.minimum.reduceat(matrix, starts, axis=1)
+    resampled_index = periods[starts].start_time
+    if timeindex.tz is not None:
+        resampled_index = resampled_index.tz_localize(timeindex.tz)
+    return resampled_index, resampled
+
+
+def series_to_long_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert timeseries data into long format holding one row per timestamp (i.e. for line plots)
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Timeseries data holding series and related timeindex (see `window_and_resample`)
+
+    Returns
+    -------
+    pd.DataFrame
+        Data holding columns "timeindex" and "value" instead of series
+    """
+    lengths = df["series"].map(len).to_numpy()
+    long_df = df.drop(columns=["series", "timeindex"]).loc[df.index.repeat(lengths)].reset_index(drop=True)
+    long_df["timeindex"] = np.concatenate([timeindex.to_numpy() for timeindex in df["timeindex"]])
+    long_df["value"] = np.concatenate(df["series"].to_numpy())
+    return long_df
@@ -8,7 +8,10 @@ urlpatterns = [
     path("dashboard/", views.DashboardView.as_view(), name="dashboard"),
     path("scalars/", views.ScalarView.as_view(), name="render_data"),
     path("scalars/chart/", views.ScalarView.as_view(embedded=True), name="data_chart"),
+    path("chart_export/", views.ChartExportView.as_view(), name="chart_export"),
+    path("api/data/", views.DataAPIView.as_view(), name="data_api"),
     path("scenarios/", views.ScenarioSelectionView.as_view(), name="scenarios"),
+    path("scenario_catalog/", views.ScenarioCatalogView.as_view(), name="scenario_catalog"),
     path("scenario_detail/", views.ScenarioDetailView.as_view(), name="scenario_detail"),
     path("upload/", views.UploadView.as_view(), name="upload"),
     path("scenario_form/", views.ScenarioFormView.as_view(), name="scenario_form"),
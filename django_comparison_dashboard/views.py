@@ -1,19 +1,31 @@
-from io import StringIO
+import hashlib
 
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Max
 from django.forms.formsets import formset_factory
-from django.http.response import HttpResponse
+from django.http.response import HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, urlencode
 from django.views.generic import DetailView, FormView, ListView, TemplateView, View
-from django_energysystem_viewer.views import get_excel_data
 from django_htmx.http import retarget
-from pandera.errors import SchemaErrors
 
-from . import graphs, models, preprocessing, sources
-from .forms import ChartTypeForm, DataFilterSet  # noqa: F401
-from .helpers import save_filters
+from . import compression, executors, models, profiling
+from .forms import ChartTypeForm, DataFilterSet, UnitForm  # noqa: F401
+from .lazy import lazy_import
 from .models import NamedFilterSettings
 
+# Modules depending on pandas and plotly are loaded on first use
+graphs = lazy_import("django_comparison_dashboard.graphs")
+export = lazy_import("django_comparison_dashboard.export")
+helpers = lazy_import("django_comparison_dashboard.helpers")
+preprocessing = lazy_import("django_comparison_dashboard.preprocessing")
+rendering = lazy_import("django_comparison_dashboard.rendering")
+sources = lazy_import("django_comparison_dashboard.sources")
+streaming = lazy_import("django_comparison_dashboard.streaming")
+
 
 class FormProcessingError(Exception):
     def __init__(self, response, message="Form processing failed"):
@@ -21,6 +33,10 @@ class FormProcessingError(Exception):
         super().__init__(message)
 
 
+class DataAPIError(Exception):
+    """Thrown if data API request is invalid"""
+
+
 class KeyValueFormPartialView(View):
     prefix = ""
     form = None
@@ -43,36 +59,28 @@ class KeyValueFormPartialView(View):
         return HttpResponse(form.as_p())
 
 
-def get_chart_and_table_from_request(request, as_html=True) -> tuple:
-    """Render chart and data table from request."""
-    selected_scenarios = request.GET.getlist("scenario_id")
-
-    if "parameters_id" in request.GET:
-        # Get form parameters from DB
-        parameters = models.FilterSettings.objects.get(pk=request.GET["parameters_id"])
-        filter_parameters = parameters.filter_set
-        selected_chart_type = parameters.graph_filter_set.pop("chart_type")
-        graph_parameters = parameters.graph_filter_set
-    else:
-        # Get form parameters from request as usual
-        filter_parameters = request.GET
-        selected_chart_type = request.GET.get("chart_type")
-        graph_parameters = request.GET
-
-    filter_set = DataFilterSet(selected_scenarios, selected_chart_type, filter_parameters)
-    if not filter_set.is_valid():
+def validate_filter_set_context(request, filter_set_context: "helpers.FilterSetContext"):
+    """Validate data filter set of context and render filters with errors if invalid."""
+    with profiling.stage("filters"):
+        filter_set_valid = filter_set_context.filter_set.is_valid()
+    if not filter_set_valid:
         response = render(
             request,
             "django_comparison_dashboard/dashboard.html#filters",
-            context=filter_set.get_context_data(),
+            context=filter_set_context.filter_set.get_context_data(),
         )
         response = retarget(response, "#filters")
         raise FormProcessingError(response, message="Filter set not valid.")
-    df = preprocessing.get_scalar_data(filter_set)
 
-    selected_chart = graphs.CHART_DATA.get(selected_chart_type)
-    form_class = selected_chart["form_class"]
-    graph_filter_set = form_class(graph_parameters, data_filter_set=filter_set)
+
+def get_chart_and_table_from_request(request, filter_set_context: "helpers.FilterSetContext | None" = None) -> tuple:
+    """Render chart and data table from request."""
+    if filter_set_context is None:
+        filter_set_context = helpers.FilterSetContext.from_request(request)
+    validate_filter_set_context(request, filter_set_context)
+    df = filter_set_context.data
+
+    graph_filter_set = filter_set_context.graph_filter_set
     if not graph_filter_set.is_valid():
         response = render(
             request,
@@ -81,16 +89,55 @@ def get_chart_and_table_from_request(request, as_html=True) -> tuple:
         )
         response = retarget(response, "#graph_options")
         raise FormProcessingError(response, message="Graph filter set not valid.")
-    chart_function = selected_chart["chart_function"]
-    chart = chart_function(df, graph_filter_set)
-    if as_html:
+    with profiling.stage("figure"):
+        chart = rendering.render_figure(filter_set_context.chart_type, df, graph_filter_set)
+    with profiling.stage("html"):
         table = df.to_html()
-        chart = chart.to_html(config={"toImageButtonOptions": {"format": "svg"}})
-    else:
-        table = df
+        chart = rendering.figure_to_html(chart)
     return chart, table
 
 
+def get_chart_validators(request) -> tuple[str | None, int | None]:
+    """
+    Return ETag and Last-Modified timestamp for chart and data requests
+
+    Chart and data only change with request parameters (including `parameters_id`, which refers to immutable filter
+    settings) or with data of selected scenarios. The latter is detected via latest import time and number of
+    selected results.
+
+    Returns
+    -------
+    tuple[str | None, int | None]
+        Weak ETag (chart HTML holds random element ids) and timestamp of latest import, if available
+    """
+    try:
+        results = models.Result.objects.filter(id__in=request.GET.getlist("scenario_id")).aggregate(
+            imported_at=Max("imported_at"), count=Count("id")
+        )
+    except ValueError:
+        return None, None
+    imported_at = results["imported_at"]
+    version = f"{request.get_full_path()}|{results['count']}|{imported_at.isoformat() if imported_at else ''}"
+    etag = f'W/"{hashlib.sha256(version.encode("utf-8")).hexdigest()}"'
+    return etag, int(imported_at.timestamp()) if imported_at else None
+
+
+def set_validators(response: HttpResponse, etag: str | None, last_modified: int | None) -> HttpResponse:
+    """
+    Set ETag and Last-Modified header of response, if given
+
+    Responses carrying validators are marked as "no-cache", as browsers would cache them heuristically otherwise and
+    show stale charts after reimport of scenarios instead of revalidating them.
+    """
+    if etag:
+        response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+    if etag or last_modified:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
 class DashboardView(TemplateView):
     """
     Initializes dashboard
@@ -101,9 +148,15 @@ class DashboardView(TemplateView):
 
     template_name = "django_comparison_dashboard/dashboard.html"
 
+    async def get(self, request, *args, **kwargs):
+        # Building filter sets queries DB and reads structure workbook, thus dashboard is rendered in bounded executor
+        return await executors.run_in_executor(self.render_dashboard, request, *args, **kwargs)
+
+    def render_dashboard(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs).render()
+
     def get_context_data(self, **kwargs):
-        abbreviations = get_excel_data("SEDOS-structure-all", "abbreviations")
-        abbreviation_list = abbreviations["abbreviations"].unique()
+        abbreviation_list = helpers.get_abbreviations("SEDOS-structure-all")
         selected_scenarios = self.request.GET.getlist("scenario_id")
         filter_setting_names = list(NamedFilterSettings.objects.values("name"))
         chart_type = self.request.GET.get("chart_type", "bar")
@@ -118,6 +171,9 @@ class DashboardView(TemplateView):
                 "chart_type_form": chart_type_form,
                 "abbreviation_list": abbreviation_list,
                 "structure_name": "SEDOS-structure-all",
+                "download_formats": {
+                    name: label for name, label in streaming.DOWNLOAD_FORMATS.items() if streaming.is_available(name)
+                },
             }
         )
 
@@ -126,9 +182,33 @@ class ScalarView(TemplateView):
     template_name = "django_comparison_dashboard/partials/plot.html"
     embedded = False
 
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
+        # Preprocessing and plotting are CPU-bound, thus rendering is run in bounded executor
+        return await executors.run_in_executor(profiling.profile(self.render_chart), request)
+
+    def render_chart(self, request):
+        with profiling.stage("validators"):
+            etag, last_modified = get_chart_validators(request)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return set_validators(not_modified, etag, last_modified)
+        response = self.get_chart_response(request, etag, last_modified)
+        return compression.compress_response(request, response)
+
+    def get_chart_response(self, request, etag: str | None = None, last_modified: int | None = None):
+        download = request.GET.get("download") == "true"
+        download_format = request.GET.get("download_format", "csv")
+        if download and download_format not in streaming.STREAM_FORMATS:
+            return HttpResponseBadRequest(f"Unknown download format '{download_format}'.")
+        if download and not streaming.is_available(download_format):
+            return HttpResponseBadRequest(f"Download format '{download_format}' is not available.")
         try:
-            chart, table = get_chart_and_table_from_request(request)
+            filter_set_context = helpers.FilterSetContext.from_request(request)
+            if download:
+                validate_filter_set_context(request, filter_set_context)
+                columns = preprocessing.get_scalar_columns(filter_set_context.filter_set)
+            else:
+                chart, table = get_chart_and_table_from_request(request, filter_set_context)
         except:  # noqa: E722
             return render(
                 request,
@@ -136,20 +216,23 @@ class ScalarView(TemplateView):
                 context={"requested_url": request.get_full_path()},
             )
 
-        if request.GET.get("download") == "true":
-            chart, table = get_chart_and_table_from_request(request, as_html=False)
-            csv_buffer = StringIO()
-            table.to_csv(csv_buffer, index=False)
-            response = HttpResponse(content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="data.csv"'
-            response.write(csv_buffer.getvalue())
-            csv_buffer.close()
-            return response
-
-        if "parameters_id" not in request.GET:
-            parameter_id = save_filters(request.GET)
+        if download:
+            # Data is read and serialized in chunks (record batches resp. row groups for Arrow IPC and Parquet)
+            chunks = preprocessing.iter_scalar_data(
+                filter_set_context.filter_set, columns, settings.DASHBOARD_DATA_API_CHUNK_SIZE
+            )
+            content = streaming.stream_chunks(chunks, columns, download_format, models.ScalarData)
+            response = StreamingHttpResponse(
+                executors.iterate_in_executor(content), content_type=streaming.STREAM_FORMATS[download_format]
+            )
+            extension = streaming.FILE_EXTENSIONS[download_format]
+            response["Content-Disposition"] = f'attachment; filename="data.{extension}"'
+            return set_validators(response, etag, last_modified)
+
+        if filter_set_context.parameters_id is None:
+            parameter_id = filter_set_context.save()
         else:
-            parameter_id = request.GET["parameters_id"]
+            parameter_id = filter_set_context.parameters_id
 
         selected_scenarios = request.GET.getlist("scenario_id")
         url = (
@@ -162,9 +245,97 @@ class ScalarView(TemplateView):
             response = HttpResponse(chart)
             response["HX-Redirect"] = url
         else:
-            context = {"chart": chart, "table": table}
+            export_query = urlencode({"scenario_id": selected_scenarios, "parameters_id": parameter_id}, doseq=True)
+            context = {
+                "chart": chart,
+                "table": table,
+                "export_query": export_query,
+                "export_available": export.is_available(),
+            }
             response = render(request, self.template_name, context)
-        return response
+        # Error responses are not marked, thus they are never answered as not modified
+        return set_validators(response, etag, last_modified)
+
+
+class ChartExportView(View):
+    """
+    Export chart of stored filter settings as static image (PNG, SVG or PDF)
+
+    Expects parameters "parameters_id" and "scenario_id" (as used by chart urls), optionally "format", "width" and
+    "height".
+    """
+
+    async def get(self, request):
+        # Charts are built and rendered via kaleido, thus export is run in bounded executor
+        return await executors.run_in_executor(self.export_chart, request)
+
+    def export_chart(self, request):
+        if not export.is_available():
+            return HttpResponse("Static image export is not available.", status=501)
+        image_format = request.GET.get("format", "png")
+        try:
+            filter_settings = models.FilterSettings.objects.get(pk=request.GET["parameters_id"])
+            filter_settings.touch()
+            result_ids = [int(result_id) for result_id in request.GET.getlist("scenario_id")]
+            size = [
+                int(request.GET[dimension]) if dimension in request.GET else None for dimension in ("width", "height")
+            ]
+        except (KeyError, ValueError, models.FilterSettings.DoesNotExist):
+            return HttpResponseBadRequest("Invalid export parameters.")
+        try:
+            image = export.export_chart(filter_settings, result_ids, image_format, *size)
+        except export.ExportError as error:
+            return HttpResponseBadRequest(str(error))
+        response = HttpResponse(image, content_type=export.EXPORT_FORMATS[image_format])
+        response["Content-Disposition"] = f'attachment; filename="chart.{image_format}"'
+        return compression.compress_response(request, response)
+
+
+class DataAPIView(View):
+    """
+    Stream scalar data of selected scenarios as NDJSON, CSV, Arrow IPC or Parquet
+
+    Accepts the same parameters as the data filter set of the dashboard ("scenario_id", filters, "group_by",
+    "order_by", units, labels etc.; units default to dashboard defaults) plus parameter "columns" to select columns
+    (repeated or comma-separated) and parameter "format" (one of `streaming.STREAM_FORMATS`, default "ndjson").
+    Ungrouped data is read from a server-side cursor and sent in chunks.
+    """
+
+    async def get(self, request):
+        try:
+            filter_set, columns, stream_format = await executors.run_in_executor(self.parse_request, request)
+        except DataAPIError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        chunks = preprocessing.iter_scalar_data(filter_set, columns, settings.DASHBOARD_DATA_API_CHUNK_SIZE)
+        content = streaming.stream_chunks(chunks, columns, stream_format, models.ScalarData)
+        return StreamingHttpResponse(
+            executors.iterate_in_executor(content), content_type=streaming.STREAM_FORMATS[stream_format]
+        )
+
+    def parse_request(self, request) -> tuple[DataFilterSet, list[str], str]:
+        """Return validated data filter set, selected columns and format from request"""
+        stream_format = request.GET.get("format", "ndjson")
+        if stream_format not in streaming.STREAM_FORMATS:
+            raise DataAPIError(f"Unknown format '{stream_format}'.")
+        if not streaming.is_available(stream_format):
+            raise DataAPIError(f"Format '{stream_format}' is not available.")
+
+        data = request.GET.copy()
+        for name, field in UnitForm.base_fields.items():
+            data.setdefault(name, field.initial)
+        data.setdefault("labels-TOTAL_FORMS", "0")
+        data.setdefault("labels-INITIAL_FORMS", "0")
+        filter_set = DataFilterSet(request.GET.getlist("scenario_id"), request.GET.get("chart_type"), data)
+        if not filter_set.is_valid():
+            invalid_forms = [name for name, form in filter_set.get_forms().items() if not form.is_valid()]
+            raise DataAPIError(f"Invalid filter parameters in {', '.join(invalid_forms)}.")
+
+        available_columns = preprocessing.get_scalar_columns(filter_set)
+        columns = [column for value in request.GET.getlist("columns") for column in value.split(",") if column]
+        unknown_columns = [column for column in columns if column not in available_columns]
+        if unknown_columns:
+            raise DataAPIError(f"Unknown columns {unknown_columns}, available columns are {available_columns}.")
+        return filter_set, columns or available_columns, stream_format
 
 
 def save_filter_settings(request):
@@ -174,7 +345,7 @@ def save_filter_settings(request):
     if NamedFilterSettings.objects.filter(name=name).exists():
         return HttpResponse("Name already exists.")
 
-    save_filters(request.POST, name=name)
+    helpers.save_filters(request.POST, name=name)
 
     response = render(
         request,
@@ -242,15 +413,17 @@ def change_chart_type(request):
 
 class ScenarioSelectionView(ListView):
     template_name = "django_comparison_dashboard/scenario_list.html"
-    extra_context = {"sources": models.Source.objects.order_by("name").all()}
     context_object_name = "scenarios"
 
+    def get_context_data(self, **kwargs):
+        # Sources are queried per request, as a queryset built at class definition would cache its results forever
+        return super().get_context_data(**kwargs) | {"sources": models.Source.objects.order_by("name")}
+
     def get_queryset(self):
+        results = models.Result.objects.only("id", "name")
         if "source" in self.request.GET:
-            source = self.request.GET["source"]
-            return models.Result.objects.filter(source=source)
-        else:
-            return models.Result.objects.filter(source=models.Source.objects.order_by("name").first())
+            return results.filter(source=self.request.GET["source"])
+        return results.filter(source=models.Source.objects.order_by("name").values("id")[:1])
 
     def get_template_names(self):
         if "source" in self.request.GET:
@@ -259,6 +432,54 @@ class ScenarioSelectionView(ListView):
             return super().get_template_names()
 
 
+class ScenarioCatalogView(View):
+    """
+    Return sources and paginated results including row counts, year range and import metadata as JSON
+
+    Results can be filtered by source via parameter "source" (source id) and paged via parameter "page".
+    Needs a constant number of queries (sources, result count and result page), as row counts are stored per result
+    at import.
+    """
+
+    async def get(self, request):
+        try:
+            source_id = int(request.GET["source"]) if "source" in request.GET else None
+        except ValueError:
+            return JsonResponse({"error": "Parameter 'source' must be a source id."}, status=400)
+        source_list = [
+            source
+            async for source in models.Source.objects.order_by("name")
+            .annotate(result_count=Count("results"))
+            .values("id", "name", "result_count")
+        ]
+        results = models.Result.objects.order_by("source__name", "name", "id").values(
+            "id",
+            "name",
+            "source_id",
+            "row_count",
+            "imported_at",
+            year_min=F("statistics__year_min"),
+            year_max=F("statistics__year_max"),
+        )
+        if source_id is not None:
+            results = results.filter(source=source_id)
+        # Paginator is sync, thus it is only used to validate page number against counted results
+        page_size = settings.DASHBOARD_CATALOG_PAGE_SIZE
+        paginator = Paginator(range(await results.acount()), page_size)
+        page = paginator.get_page(request.GET.get("page"))
+        offset = (page.number - 1) * page_size
+        response = JsonResponse(
+            {
+                "sources": source_list,
+                "results": [result async for result in results[offset : offset + page_size]],
+                "page": page.number,
+                "num_pages": paginator.num_pages,
+                "count": paginator.count,
+            }
+        )
+        return compression.compress_response(request, response)
+
+
 class ScenarioDetailView(DetailView):
     template_name = "django_comparison_dashboard/scenario_list.html#scenario"
     context_object_name = "scenario"
@@ -277,6 +498,24 @@ class UploadView(TemplateView):
 
 class ScenarioFormView(FormView):
     template_name = "django_comparison_dashboard/upload_data.html#scenario"
+    http_method_names = ["get", "post", "options"]
+    scenario_list = None
+
+    async def get(self, request, *args, **kwargs):
+        self.scenario_list = await self.list_scenarios()
+        return super().get(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        self.scenario_list = await self.list_scenarios()
+        # Scenario import downloads and stores data, thus it is run in bounded executor
+        return await executors.run_in_executor(super().post, request, *args, **kwargs)
+
+    async def list_scenarios(self) -> list:
+        """List scenarios of source without blocking the event loop (empty if source cannot list its scenarios)"""
+        try:
+            return await self.get_source().alist_scenarios()
+        except NotImplementedError:
+            return []
 
     def get_source(self):
         source_name = self.request.GET["source"] if self.request.method == "GET" else self.request.POST["source"]
@@ -284,13 +523,13 @@ class ScenarioFormView(FormView):
         return source
 
     def get_form_class(self):
-        form = self.get_source().form
-        try:
-            scenario_list = self.get_source().list_scenarios()
-        except NotImplementedError:
-            scenario_list = []
-        if scenario_list:
-            form.base_fields["scenario_id"].choices = [(scenario.id, scenario.id) for scenario in scenario_list]
+        return self.get_source().form
+
+    def get_form(self, form_class=None):
+        # Choices are set per form instance, as setting them on form class would leak them into other requests
+        form = super().get_form(form_class)
+        if self.scenario_list:
+            form.fields["scenario_id"].choices = [(scenario.id, scenario.id) for scenario in self.scenario_list]
         return form
 
     def form_valid(self, form):
@@ -298,6 +537,8 @@ class ScenarioFormView(FormView):
         scenario = source.scenario(**form.cleaned_data)
         if models.Result.objects.filter(source__name=source.name, name=scenario.id).exists():
             return HttpResponse("Scenario already present in database.")
+        from pandera.errors import SchemaErrors
+
         try:
             scenario.download()
         except SchemaErrors as err:
@@ -0,0 +1,43 @@
+import contextvars
+import threading
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from django_comparison_dashboard import executors, forms, views
+from django_comparison_dashboard.sources import databus
+
+request_name = contextvars.ContextVar("request_name", default=None)
+
+
+class ExecutorTest(SimpleTestCase):
+    async def test_jobs_are_run_in_executor_thread(self):
+        request_name.set("test")
+
+        def job(value):
+            return value, request_name.get(), threading.current_thread().name
+
+        value, name, thread_name = await executors.run_in_executor(job, 1)
+        assert (value, name) == (1, "test")
+        assert thread_name.startswith("dashboard")
+        assert thread_name != threading.current_thread().name
+
+
+class ScenarioFormViewTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    async def get_form(self, source: str):
+        response = await views.ScenarioFormView.as_view()(self.factory.get("/scenario_form/", {"source": source}))
+        return response.context_data["form"]
+
+    async def test_scenarios_are_listed_asynchronously(self):
+        artifacts = ["https://databus.openenergyplatform.org/user/group/a"]
+        with mock.patch.object(databus, "aget_artifacts_from_collection", mock.AsyncMock(return_value=artifacts)):
+            form = await self.get_form("Databus")
+        assert form.fields["scenario_id"].choices == [(artifacts[0], artifacts[0])]
+        assert forms.DatabusSourceUploadForm.base_fields["scenario_id"].choices == []
+
+    async def test_sources_without_listing_render_form(self):
+        form = await self.get_form("CSV")
+        assert isinstance(form, forms.CSVSourceUploadForm)
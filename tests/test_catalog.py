@@ -0,0 +1,80 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import include, path
+
+from django_comparison_dashboard import models, views
+
+# Scenario list template links to dashboard urls
+urlpatterns = [path("", include("django_comparison_dashboard.urls"))]
+
+
+class ScenarioCatalogTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        sources = [models.Source.objects.create(name=name) for name in ("B", "A")]
+        for source in sources:
+            models.Result.objects.bulk_create(
+                models.Result(name=f"{source.name}{i}", source=source, row_count=i) for i in range(3)
+            )
+
+    def get_catalog(self, **params) -> dict:
+        response = async_to_sync(views.ScenarioCatalogView.as_view())(self.factory.get("/scenario_catalog/", params))
+        return json.loads(response.content)
+
+    @override_settings(DASHBOARD_CATALOG_PAGE_SIZE=4)
+    def test_catalog_is_paginated(self):
+        with self.assertNumQueries(3):
+            catalog = self.get_catalog()
+        assert [source["name"] for source in catalog["sources"]] == ["A", "B"]
+        assert [source["result_count"] for source in catalog["sources"]] == [3, 3]
+        assert [result["name"] for result in catalog["results"]] == ["A0", "A1", "A2", "B0"]
+        assert catalog["num_pages"] == 2
+        assert catalog["count"] == 6
+
+        catalog = self.get_catalog(page=2)
+        assert [result["row_count"] for result in catalog["results"]] == [1, 2]
+
+    def test_catalog_holds_year_range(self):
+        result = models.Result.objects.get(name="A0")
+        models.ResultStatistics.objects.create(result=result, year_min=2020, year_max=2050)
+        catalog = self.get_catalog()
+        assert (catalog["results"][0]["year_min"], catalog["results"][0]["year_max"]) == (2020, 2050)
+        assert catalog["results"][1]["year_min"] is None
+
+    def test_catalog_is_filtered_by_source(self):
+        source = models.Source.objects.get(name="B")
+        catalog = self.get_catalog(source=source.id)
+        assert {result["source_id"] for result in catalog["results"]} == {source.id}
+
+    def test_invalid_source_is_rejected(self):
+        response = async_to_sync(views.ScenarioCatalogView.as_view())(
+            self.factory.get("/scenario_catalog/", {"source": "abc"})
+        )
+        assert response.status_code == 400
+        assert "source" in json.loads(response.content)["error"]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ScenarioSelectionTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.source = models.Source.objects.create(name="A")
+        models.Result.objects.create(name="A0", source=self.source)
+
+    def get_scenarios(self, **params):
+        return views.ScenarioSelectionView.as_view()(self.factory.get("/scenarios/", params))
+
+    def test_page_is_rendered(self):
+        # Full page extends base template of host project, thus only template selection is checked
+        response = self.get_scenarios()
+        assert response.template_name[0] == "django_comparison_dashboard/scenario_list.html"
+
+    def test_source_renders_scenarios_partial(self):
+        response = self.get_scenarios(source=self.source.id)
+        assert response.template_name == ["django_comparison_dashboard/scenario_list.html#scenarios"]
+        content = response.render().content.decode()
+        assert 'id="scenarios"' not in content
+        assert "Select scenarios" not in content
+        assert "A0" in content
@@ -0,0 +1,93 @@
+import gzip
+from urllib.parse import urlencode
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import include, path
+from django.utils import timezone
+from test_helpers import REQUEST_DATA, create_scalar_data
+
+from django_comparison_dashboard import compression, models, views
+
+# Chart template links to dashboard urls
+urlpatterns = [path("", include("django_comparison_dashboard.urls"))]
+
+
+class CompressionTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.content = b"<div>chart</div>" * 100
+
+    def test_response_is_gzipped(self):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        response = compression.compress_response(request, HttpResponse(self.content))
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(response.content) == self.content
+
+    def test_response_is_not_compressed_if_not_accepted(self):
+        response = compression.compress_response(self.factory.get("/"), HttpResponse(self.content))
+        assert not response.has_header("Content-Encoding")
+        response = compression.compress_response(
+            self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip"), HttpResponse(b"small")
+        )
+        assert not response.has_header("Content-Encoding")
+
+    def test_binary_responses_are_not_compressed(self):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        for content_type in ("image/png", "application/vnd.apache.parquet"):
+            response = compression.compress_response(request, HttpResponse(self.content, content_type=content_type))
+            assert not response.has_header("Content-Encoding")
+
+    def test_streamed_response_is_gzipped(self):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = StreamingHttpResponse(iter([self.content, self.content]), content_type="text/csv")
+        response = compression.compress_response(request, response)
+        assert response["Content-Encoding"] == "gzip"
+        assert gzip.decompress(b"".join(response.streaming_content)) == self.content * 2
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ConditionalChartTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        source = models.Source.objects.create(name="Test")
+        self.result = models.Result.objects.create(name="Test", source=source, imported_at=timezone.now())
+        create_scalar_data(self.result)
+        self.url = "/scalars/?" + urlencode(REQUEST_DATA | {"scenario_id": self.result.id}, doseq=True)
+
+    def get_chart(self, **headers):
+        return views.ScalarView().render_chart(self.factory.get(self.url, **headers))
+
+    def test_unchanged_chart_is_not_resent(self):
+        response = self.get_chart()
+        assert response.status_code == 200
+        assert b"plotly" in response.content
+        etag = response["ETag"]
+        assert etag.startswith('W/"')
+        assert response.has_header("Last-Modified")
+        assert response["Cache-Control"] == "no-cache"
+
+        not_modified = self.get_chart(HTTP_IF_NONE_MATCH=etag)
+        assert not_modified.status_code == 304
+        assert not_modified["Cache-Control"] == "no-cache"
+        assert self.get_chart(HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code == 304
+
+        # Reimport of scenario changes data version
+        models.Result.objects.filter(pk=self.result.pk).update(
+            imported_at=self.result.imported_at + timezone.timedelta(minutes=1)
+        )
+        response = self.get_chart(HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_chart_is_compressed(self):
+        response = self.get_chart(HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        assert b"plotly" in gzip.decompress(response.content)
+
+    def test_errors_are_not_validated(self):
+        self.url = "/scalars/?scenario_id=x"
+        response = self.get_chart()
+        assert not response.has_header("ETag")
+        assert not response.has_header("Cache-Control")
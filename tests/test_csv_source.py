@@ -0,0 +1,68 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pandera.errors
+from django.test import SimpleTestCase, TestCase
+
+from django_comparison_dashboard import models, settings
+from django_comparison_dashboard.sources import core
+from django_comparison_dashboard.sources.csv import CSVDataSource, CSVScenario
+
+CSV = """scenario;process;parameter;sector;category;specification;new;groups;input_groups;output_groups;year;unit;value
+base;pp_coal;flow;pow;;;True;["fossil", "coal"];[];;2020;MWh;1.5
+base;pp_wind;flow;pow;re;;false;[];[];[];2030;MWh;2
+"""
+
+
+class ArrayParsingTest(SimpleTestCase):
+    def test_array_strings_are_parsed(self):
+        column = pd.Series(['["a", "b c"]', "['a']", "[a, b]", "[]", "", "no list", '["a", "b c"]'])
+        parsed = core.parse_array_column(column)
+        assert parsed.tolist() == [["a", "b c"], ["a"], ["a", "b"], [], [], [], ["a", "b c"]]
+
+    def test_lists_and_missing_values_are_handled(self):
+        column = pd.Series([["a"], None, np.nan, "[b]"])
+        assert core.parse_array_column(column).tolist() == [["a"], [], [], ["b"]]
+
+
+class CSVSourceTest(TestCase):
+    def setUp(self):
+        self.scenario = self.get_scenario(CSV)
+
+    def get_scenario(self, csv: str) -> CSVScenario:
+        csv_file = io.BytesIO(csv.encode("utf-8"))
+        csv_file.name = "test.csv"
+        return CSVScenario(1, settings.DataType.Scalar, csv_file)
+
+    def test_data_is_typed_by_schema(self):
+        data = CSVDataSource.download_scenario(self.scenario)
+        assert str(data["process"].dtype) == "category"
+        assert str(data["year"].dtype) == "Int64"
+        assert str(data["new"].dtype) == "boolean"
+        assert data["value"].dtype == float
+        assert data["groups"].tolist() == [["fossil", "coal"], []]
+        assert data["output_groups"].tolist() == [[], []]
+
+    def test_typed_data_is_stored(self):
+        self.scenario.download()
+        coal, wind = models.ScalarData.objects.order_by("process")
+        assert coal.category is None
+        assert coal.new is True
+        assert coal.groups == ["fossil", "coal"]
+        assert wind.category == "re"
+        assert wind.year == 2030
+        result = models.Result.objects.get()
+        assert result.row_count == 2
+        assert result.imported_at is not None
+
+    def test_missing_strings_are_stored_empty(self):
+        self.get_scenario(CSV.replace("base;pp_wind;flow;pow;", "base;;flow;;")).download()
+        wind = models.ScalarData.objects.get(category="re")
+        assert wind.process == ""
+        assert wind.sector == ""
+
+    def test_missing_required_values_are_rejected(self):
+        with self.assertRaises(pandera.errors.SchemaErrors):
+            self.get_scenario(CSV.replace(";2030;", ";;")).download()
+        assert not models.ScalarData.objects.exists()
@@ -0,0 +1,259 @@
+import asyncio
+import gzip
+import importlib.util
+import io
+import json
+import threading
+from contextlib import aclosing
+from unittest import mock, skipUnless
+from urllib.parse import urlencode
+
+import pandas as pd
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from test_helpers import REQUEST_DATA, create_scalar_data
+
+from django_comparison_dashboard import executors, models, preprocessing, streaming, views
+from django_comparison_dashboard.forms import DataFilterSet
+
+
+class IterateInExecutorTest(SimpleTestCase):
+    async def consume(self, iterable, limit: int | None = None) -> list:
+        items = []
+        async with aclosing(executors.iterate_in_executor(iterable)) as iterator:
+            async for item in iterator:
+                items.append(item)
+                if limit and len(items) == limit:
+                    break
+        return items
+
+    async def test_items_are_yielded_in_order(self):
+        assert await self.consume(range(10)) == list(range(10))
+
+    async def test_errors_are_raised(self):
+        def failing():
+            yield 1
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            await self.consume(failing())
+
+    async def test_iterable_is_closed_if_consumer_stops(self):
+        closed = []
+
+        def endless():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                closed.append(True)
+
+        assert await self.consume(endless(), limit=3) == [0, 1, 2]
+        assert closed == [True]
+
+    async def test_stream_is_stopped_if_response_is_closed(self):
+        closed = []
+        threads = []
+
+        def endless():
+            try:
+                while True:
+                    threads.append(threading.current_thread().name)
+                    yield b"data"
+            finally:
+                closed.append(True)
+
+        stream = executors.iterate_in_executor(endless())
+        response = StreamingHttpResponse(stream)
+        assert await anext(aiter(response.streaming_content)) == b"data"
+        # Django closes response (from another thread) once it is sent
+        await sync_to_async(response.close)()
+        await asyncio.wait_for(stream.producer, timeout=5)
+        assert closed == [True]
+        # Streams are produced in separate pool, thus they do not block chart rendering
+        assert threads[0].startswith("dashboard-stream")
+
+
+class ScalarDataChunksTest(TestCase):
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.result = models.Result.objects.create(name="Test", source=source)
+        create_scalar_data(self.result, groups=["a", "b"])
+
+    def get_filter_set(self, **data) -> DataFilterSet:
+        request_data = {key: value for key, value in REQUEST_DATA.items() if key != "group_by"}
+        filter_set = DataFilterSet([self.result.id], "bar", request_data | data)
+        assert filter_set.is_valid()
+        return filter_set
+
+    def test_data_is_read_in_chunks(self):
+        chunks = list(
+            preprocessing.iter_scalar_data(
+                self.get_filter_set(order_by=["process"]), ["process", "value", "groups"], chunk_size=7
+            )
+        )
+        assert [len(chunk) for chunk in chunks] == [7, 7, 6]
+        assert list(chunks[0].columns) == ["process", "value", "groups"]
+        assert chunks[0]["process"].tolist()[:2] == ["process_0", "process_1"]
+        # Units are converted per chunk
+        assert chunks[0]["value"].tolist()[1] == 0.001
+
+    def test_grouped_data_is_split_into_chunks(self):
+        chunks = list(preprocessing.iter_scalar_data(self.get_filter_set(group_by=["sector"]), chunk_size=3))
+        df = pd.concat(chunks)
+        assert list(df.columns) == ["sector", "unit", "value"]
+        assert len(df) == 4
+
+    def test_chunks_are_serialized(self):
+        chunks = [pd.DataFrame({"process": ["a", "b"], "year": [2020, None]}), pd.DataFrame({"process": ["c"]})]
+        chunks[1]["year"] = 2030
+        ndjson = b"".join(streaming.stream_chunks(chunks, ["process", "year"], "ndjson", models.ScalarData))
+        rows = [json.loads(line) for line in ndjson.splitlines()]
+        assert rows == [{"process": "a", "year": 2020}, {"process": "b", "year": None}, {"process": "c", "year": 2030}]
+        csv = b"".join(streaming.stream_chunks(chunks, ["process", "year"], "csv", models.ScalarData))
+        assert pd.read_csv(io.BytesIO(csv))["process"].tolist() == ["a", "b", "c"]
+
+    def test_frames_are_split_into_chunks(self):
+        chunks = list(streaming.split_frame(pd.DataFrame({"value": range(5)}), 2))
+        assert [chunk["value"].tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
+
+    def test_chunk_sink_collects_written_bytes(self):
+        sink = streaming.ChunkSink()
+        sink.write(b"abc")
+        sink.write(memoryview(b"de"))
+        assert sink.tell() == 5
+        assert sink.take() == b"abcde"
+        assert sink.take() == b""
+        assert sink.tell() == 5
+
+
+class DataAPIViewTest(TransactionTestCase):
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.result = models.Result.objects.create(name="Test", source=source)
+        create_scalar_data(self.result, groups=["a", "b"])
+        self.factory = RequestFactory()
+
+    def request(self, **params):
+        @async_to_sync
+        async def get():
+            response = await views.DataAPIView.as_view()(self.factory.get("/api/data/", params))
+            if response.status_code != 200:
+                return response, None
+            return response, b"".join([part async for part in response.streaming_content])
+
+        return get()
+
+    def test_data_is_streamed_as_ndjson(self):
+        response, content = self.request(scenario_id=self.result.id, columns="process,unit", energy="MWh")
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert len(rows) == 20
+        assert rows[0] == {"process": "process_0", "unit": "MWh"}
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "needs pyarrow")
+    def test_data_is_streamed_as_arrow(self):
+        import pyarrow as pa
+
+        with override_settings(DASHBOARD_DATA_API_CHUNK_SIZE=7):
+            _, content = self.request(scenario_id=self.result.id, columns="process,year,groups", format="arrow")
+        reader = pa.ipc.open_stream(content)
+        batches = list(reader)
+        # One record batch per chunk
+        assert [batch.num_rows for batch in batches] == [7, 7, 6]
+        assert reader.schema.field("year").type == pa.int64()
+        # Array fields are joined into strings
+        assert reader.schema.field("groups").type == pa.string()
+        assert batches[0].column("groups")[0].as_py() == "a/b"
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "needs pyarrow")
+    def test_data_is_streamed_as_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        _, content = self.request(scenario_id=self.result.id, columns="process,value", format="parquet")
+        table = pq.read_table(io.BytesIO(content))
+        assert table.column_names == ["process", "value"]
+        assert table.schema.field("value").type == pa.float64()
+        assert table.num_rows == 20
+
+    def test_unknown_columns_are_rejected(self):
+        response, _ = self.request(scenario_id=self.result.id, columns="unknown")
+        assert response.status_code == 400
+        assert "unknown" in json.loads(response.content)["error"]
+
+
+@override_settings(DASHBOARD_DATA_API_CHUNK_SIZE=7)
+class DataDownloadTest(TransactionTestCase):
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.result = models.Result.objects.create(name="Test", source=source)
+        create_scalar_data(self.result, groups=["a", "b"])
+        self.factory = RequestFactory()
+
+    def download(self, headers: dict | None = None, **params):
+        data = REQUEST_DATA | {"scenario_id": self.result.id, "download": "true"} | params
+        request = self.factory.get("/scalars/?" + urlencode(data, doseq=True), headers=headers)
+
+        @async_to_sync
+        async def get():
+            response = await views.ScalarView.as_view()(request)
+            if not response.streaming:
+                return response, None
+            return response, b"".join([part async for part in response.streaming_content])
+
+        return get()
+
+    def test_data_is_downloaded_as_csv(self):
+        response, content = self.download()
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        assert response["Content-Disposition"] == 'attachment; filename="data.csv"'
+        df = pd.read_csv(io.BytesIO(content))
+        assert list(df.columns) == ["sector", "year", "unit", "value"]
+        assert len(df) == 12
+
+    def test_csv_download_is_streamed_gzipped(self):
+        response, content = self.download(headers={"Accept-Encoding": "gzip"})
+        assert response["Content-Encoding"] == "gzip"
+        assert len(pd.read_csv(io.BytesIO(gzip.decompress(content)))) == 12
+
+    def test_unknown_download_format_is_rejected(self):
+        response, _ = self.download(download_format="xlsx")
+        assert response.status_code == 400
+
+    def test_binary_formats_need_pyarrow(self):
+        with mock.patch("importlib.util.find_spec", return_value=None):
+            response, _ = self.download(download_format="parquet")
+        assert response.status_code == 400
+        assert b"not available" in response.content
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "needs pyarrow")
+    def test_data_is_downloaded_as_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        response, content = self.download(headers={"Accept-Encoding": "gzip"}, download_format="parquet")
+        assert response["Content-Disposition"] == 'attachment; filename="data.parquet"'
+        # Parquet is compressed already
+        assert not response.has_header("Content-Encoding")
+        parquet_file = pq.ParquetFile(io.BytesIO(content))
+        # One row group per chunk
+        assert parquet_file.metadata.num_row_groups == 2
+        table = parquet_file.read()
+        assert table.column_names == ["sector", "year", "unit", "value"]
+        assert table.schema.field("year").type == pa.int64()
+        assert table.num_rows == 12
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "needs pyarrow")
+    def test_data_is_downloaded_as_arrow(self):
+        import pyarrow as pa
+
+        response, content = self.download(download_format="arrow")
+        assert response["Content-Disposition"] == 'attachment; filename="data.arrows"'
+        table = pa.ipc.open_stream(content).read_all()
+        assert table.num_rows == 12
+        assert table.schema.field("value").type == pa.float64()
@@ -0,0 +1,131 @@
+import io
+import tempfile
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.http import QueryDict
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import include, path
+from django.utils import timezone
+from test_helpers import REQUEST_DATA, create_scalar_data
+
+from django_comparison_dashboard import export, models, views
+from django_comparison_dashboard.helpers import FilterSetContext
+
+# Chart template links to dashboard urls
+urlpatterns = [path("", include("django_comparison_dashboard.urls"))]
+
+
+class ChartExportTest(TestCase):
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.result = models.Result.objects.create(name="Test", source=source, imported_at=timezone.now())
+        create_scalar_data(self.result)
+        data = QueryDict(urlencode(REQUEST_DATA | {"scenario_id": self.result.id}, doseq=True))
+        parameters_id = FilterSetContext([self.result.id], "bar", data, data).save()
+        self.filter_settings = models.FilterSettings.objects.get(pk=parameters_id)
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_export_key_depends_on_format_and_data(self):
+        key = export.get_export_key(self.filter_settings, [self.result.id], "png")
+        assert export.get_export_key(self.filter_settings, [self.result.id], "png") == key
+        assert export.get_export_key(self.filter_settings, [self.result.id], "svg") != key
+        assert export.get_export_key(self.filter_settings, [self.result.id], "png", width=1000) != key
+        models.Result.objects.filter(pk=self.result.pk).update(imported_at=timezone.now())
+        assert export.get_export_key(self.filter_settings, [self.result.id], "png") != key
+
+    def test_exported_charts_are_cached(self):
+        with mock.patch.object(export, "figure_to_image", return_value=b"<svg></svg>") as figure_to_image:
+            assert export.export_chart(self.filter_settings, [self.result.id], "svg") == b"<svg></svg>"
+            assert export.export_chart(self.filter_settings, [self.result.id], "svg") == b"<svg></svg>"
+        figure_to_image.assert_called_once()
+        figure = figure_to_image.call_args.args[0]
+        assert figure["data"][0]["type"] == "bar"
+
+    def test_concurrently_exported_chart_is_stored_once(self):
+        key = export.get_export_key(self.filter_settings, [self.result.id], "svg")
+        cache_path = export.get_cache_path(key, "svg")
+
+        def render_concurrently(*args, **kwargs):
+            # Another export of the same chart stores image while this one is rendered
+            default_storage.save(cache_path, io.BytesIO(b"<svg></svg>"))
+            return b"<svg></svg>"
+
+        with mock.patch.object(export, "figure_to_image", side_effect=render_concurrently):
+            export.export_chart(self.filter_settings, [self.result.id], "svg")
+        assert default_storage.listdir(cache_path.rsplit("/", 1)[0])[1] == [f"{key}.svg"]
+        with default_storage.open(cache_path) as cached_file:
+            assert cached_file.read() == b"<svg></svg>"
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_export_links_are_shown_if_kaleido_is_installed(self):
+        request = RequestFactory().get("/scalars/?" + urlencode(REQUEST_DATA | {"scenario_id": self.result.id}, True))
+        with mock.patch.object(export, "is_available", return_value=True):
+            assert b"format=png" in views.ScalarView().render_chart(request).content
+        with mock.patch.object(export, "is_available", return_value=False):
+            assert b"format=png" not in views.ScalarView().render_chart(request).content
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(export.ExportError):
+            export.export_chart(self.filter_settings, [self.result.id], "gif")
+
+    def test_image_size_is_limited(self):
+        for size in (0, -1, export.MAX_IMAGE_SIZE + 1):
+            with self.assertRaises(export.ExportError):
+                export.export_chart(self.filter_settings, [self.result.id], "png", width=size)
+        request = RequestFactory().get(
+            "/chart_export/",
+            {"parameters_id": self.filter_settings.id, "scenario_id": self.result.id, "height": 100000},
+        )
+        with mock.patch.object(export, "is_available", return_value=True):
+            response = async_to_sync(views.ChartExportView.as_view())(request)
+        assert response.status_code == 400
+
+    def test_export_view_needs_kaleido(self):
+        request = RequestFactory().get("/chart_export/", {"parameters_id": self.filter_settings.id})
+        with mock.patch.object(export, "is_available", return_value=False):
+            response = async_to_sync(views.ChartExportView.as_view())(request)
+        assert response.status_code == 501
+
+
+class NamedChartExportTest(TransactionTestCase):
+    # Charts are exported in worker threads using their own DB connections, thus data has to be committed
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.result = models.Result.objects.create(name="Test", source=source, imported_at=timezone.now())
+        create_scalar_data(self.result)
+        data = QueryDict(urlencode(REQUEST_DATA | {"scenario_id": self.result.id}, doseq=True))
+        for name in ("Power Sector", "Industry"):
+            parameters_id = FilterSetContext([self.result.id], "bar", data, data).save()
+            models.NamedFilterSettings.objects.create(name=name, filter_settings_id=parameters_id)
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.report_dir = Path(media_root.name) / "report"
+
+    def test_named_charts_are_exported(self):
+        with mock.patch.object(export, "figure_to_image", return_value=b"<svg></svg>"):
+            exported = export.export_named_charts(self.report_dir, [self.result.id], "svg", workers=2)
+        assert exported == {
+            "Industry": self.report_dir / "industry.svg",
+            "Power Sector": self.report_dir / "power-sector.svg",
+        }
+        assert (self.report_dir / "power-sector.svg").read_bytes() == b"<svg></svg>"
+
+    def test_export_command_writes_report(self):
+        with (
+            mock.patch.object(export, "is_available", return_value=True),
+            mock.patch.object(export, "figure_to_image", return_value=b"png"),
+        ):
+            call_command("export_charts", str(self.report_dir), "--results", str(self.result.id), stdout=io.StringIO())
+        assert sorted(path.name for path in self.report_dir.iterdir()) == ["industry.png", "power-sector.png"]
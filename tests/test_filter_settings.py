@@ -0,0 +1,47 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from django_comparison_dashboard.helpers import FilterSetContext
+from django_comparison_dashboard.models import FilterSettings, NamedFilterSettings
+
+
+class FilterSettingsTest(TestCase):
+    def test_snapshots_are_deduplicated(self):
+        first = FilterSettings.get_or_create_snapshot({"year": ["2020"], "group_by": []}, {"chart_type": "bar"})
+        second = FilterSettings.get_or_create_snapshot({"group_by": [], "year": ["2020"]}, {"chart_type": "bar"})
+        third = FilterSettings.get_or_create_snapshot({"group_by": [], "year": ["2030"]}, {"chart_type": "bar"})
+        assert first.id == second.id
+        assert first.id != third.id
+        assert FilterSettings.objects.count() == 2
+
+    def test_cleanup_of_orphaned_snapshots(self):
+        old = timezone.now() - timedelta(days=100)
+        orphaned = FilterSettings.get_or_create_snapshot({"year": ["2020"]}, {"chart_type": "bar"})
+        named = FilterSettings.get_or_create_snapshot({"year": ["2030"]}, {"chart_type": "bar"})
+        NamedFilterSettings.objects.create(name="named", filter_settings=named)
+        recent = FilterSettings.get_or_create_snapshot({"year": ["2040"]}, {"chart_type": "bar"})
+        FilterSettings.objects.filter(pk__in=[orphaned.pk, named.pk]).update(last_used=old)
+
+        call_command("cleanup_filter_settings", stdout=StringIO())
+        assert set(FilterSettings.objects.values_list("pk", flat=True)) == {named.pk, recent.pk}
+
+    def test_loaded_snapshots_survive_cleanup(self):
+        old = timezone.now() - timedelta(days=100)
+        loaded = FilterSettings.get_or_create_snapshot({"year": ["2020"]}, {"chart_type": "bar"})
+        FilterSettings.objects.filter(pk=loaded.pk).update(last_used=old)
+
+        FilterSetContext.from_request(RequestFactory().get("/", {"parameters_id": loaded.pk}))
+        call_command("cleanup_filter_settings", stdout=StringIO())
+        assert FilterSettings.objects.filter(pk=loaded.pk).exists()
+
+    def test_last_used_is_written_at_most_once_a_day(self):
+        recently = timezone.now() - timedelta(hours=1)
+        snapshot = FilterSettings.get_or_create_snapshot({"year": ["2020"]}, {"chart_type": "bar"})
+        FilterSettings.objects.filter(pk=snapshot.pk).update(last_used=recently)
+
+        FilterSettings.objects.get(pk=snapshot.pk).touch()
+        assert FilterSettings.objects.get(pk=snapshot.pk).last_used == recently
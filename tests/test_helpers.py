@@ -0,0 +1,132 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlencode
+
+import pandas as pd
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from django_comparison_dashboard import graphs, helpers, models
+from django_comparison_dashboard.helpers import FilterSetContext
+
+REQUEST_DATA = {
+    "chart_type": "bar",
+    "group_by": ["sector", "year"],
+    "energy": "GWh",
+    "power": "GW",
+    "power_per_hour": "MW/h",
+    "costs": "MEUR",
+    "mass": "Gt",
+    "mass_per_year": "Gt/a",
+    "labels-TOTAL_FORMS": 0,
+    "labels-INITIAL_FORMS": 0,
+    "x": "year",
+    "y": "value",
+    "color": "sector",
+    "hover_name": "sector",
+    "orientation": "v",
+    "barmode": "relative",
+    "facet_col_wrap": 1,
+    "colors-TOTAL_FORMS": 0,
+    "colors-INITIAL_FORMS": 0,
+}
+
+
+def create_scalar_data(result: models.Result, rows: int = 20, **fields) -> None:
+    """Store synthetic scalar data for result (one process per row, spread over 4 sectors and 3 years)"""
+    models.ScalarData.objects.bulk_create(
+        models.ScalarData(
+            **{
+                "result": result,
+                "scenario": result.name,
+                "process": f"process_{i}",
+                "parameter": "flow",
+                "value": i,
+                "year": 2020 + i % 3 * 10,
+                "sector": f"sector_{i % 4}",
+                "new": False,
+                "unit": "MWh",
+                "groups": [],
+                "input_groups": [],
+                "output_groups": [],
+            }
+            | fields
+        )
+        for i in range(rows)
+    )
+
+
+class FilterSetContextTest(TestCase):
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.results = [models.Result.objects.create(name=f"Test {i}", source=source) for i in range(3)]
+        for result in self.results:
+            create_scalar_data(result)
+
+    def render(self, selected_scenarios: list[int]) -> int:
+        """Render chart and save settings as done in ScalarView"""
+        data = QueryDict(urlencode(REQUEST_DATA | {"scenario_id": selected_scenarios}, doseq=True))
+        filter_set_context = FilterSetContext(selected_scenarios, "bar", data, data)
+        assert filter_set_context.filter_set.is_valid()
+        assert filter_set_context.graph_filter_set.is_valid()
+        graphs.bar_plot(filter_set_context.data, filter_set_context.graph_filter_set).to_html()
+        return filter_set_context.save()
+
+    def test_query_count_per_render(self):
+        parameters_id = self.render([self.results[0].id])
+        # Scenario filter choices (one query per filter), scalar data and lookup of filter settings (recently used
+        # settings are not written again)
+        with self.assertNumQueries(len(models.ScalarData.filters) + 2):
+            assert self.render([self.results[0].id]) == parameters_id
+        with self.assertNumQueries(len(models.ScalarData.filters) + 2):
+            self.render([self.results[0].id])
+        # Query count does not depend on number of selected scenarios
+        self.render([result.id for result in self.results])
+        with self.assertNumQueries(len(models.ScalarData.filters) + 2):
+            self.render([result.id for result in self.results])
+
+    def test_saved_settings_are_not_affected_by_rendering(self):
+        parameters_id = self.render([self.results[0].id])
+        graph_filter_set = models.FilterSettings.objects.get(pk=parameters_id).graph_filter_set
+        assert "chart_height" in graph_filter_set
+        assert "color_discrete_map" not in graph_filter_set
+
+
+class AbbreviationsTest(SimpleTestCase):
+    def setUp(self):
+        helpers._abbreviations_cache.clear()
+        self.addCleanup(helpers._abbreviations_cache.clear)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.workbook = Path(directory.name) / "structure.xlsx"
+        self.workbook.write_bytes(b"")
+        # Energy system viewer (which parses workbooks) is mocked
+        self.get_excel_data = mock.Mock(return_value={"abbreviations": pd.Series(["a", "b", "a"])})
+        viewer = mock.Mock(get_excel_data=self.get_excel_data)
+        patcher = mock.patch.dict(
+            sys.modules, {"django_energysystem_viewer": viewer, "django_energysystem_viewer.views": viewer}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_abbreviations_are_reloaded_if_workbook_changes(self):
+        with override_settings(DASHBOARD_STRUCTURE_WORKBOOKS={"structure": str(self.workbook)}):
+            assert helpers.get_abbreviations("structure").tolist() == ["a", "b"]
+            helpers.get_abbreviations("structure")
+            assert self.get_excel_data.call_count == 1
+
+            modified = self.workbook.stat().st_mtime + 10
+            os.utime(self.workbook, (modified, modified))
+            helpers.get_abbreviations("structure")
+            assert self.get_excel_data.call_count == 2
+
+    def test_missing_workbook_is_cached_until_restart(self):
+        with override_settings(
+            DASHBOARD_STRUCTURE_WORKBOOKS={"structure": str(self.workbook.with_name("missing.xlsx"))}
+        ):
+            helpers.get_abbreviations("structure")
+            helpers.get_abbreviations("structure")
+        assert self.get_excel_data.call_count == 1
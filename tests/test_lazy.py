@@ -0,0 +1,45 @@
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from django_comparison_dashboard.lazy import LazyModule, lazy_import
+
+SLOW_MODULE = """
+import time
+
+time.sleep(0.2)
+VALUE = 42
+"""
+
+
+class LazyImportTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        Path(directory.name, "slow_module.py").write_text(SLOW_MODULE)
+        sys.path.insert(0, directory.name)
+        self.addCleanup(sys.path.remove, directory.name)
+        self.addCleanup(sys.modules.pop, "slow_module", None)
+
+    def test_module_is_imported_on_first_attribute_access(self):
+        module = lazy_import("slow_module")
+        assert isinstance(module, LazyModule)
+        assert "slow_module" not in sys.modules
+        assert module.VALUE == 42
+        assert "slow_module" in sys.modules
+        assert lazy_import("slow_module") is sys.modules["slow_module"]
+
+    def test_concurrent_first_access_waits_for_import(self):
+        module = lazy_import("slow_module")
+        barrier = threading.Barrier(4)
+
+        def get_value():
+            barrier.wait()
+            return module.VALUE
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert list(pool.map(lambda _: get_value(), range(4))) == [42] * 4
@@ -1,4 +1,6 @@
-from django.test import TestCase
+import json
+
+from django.test import SimpleTestCase, TestCase
 
 from django_comparison_dashboard import models
 from django_comparison_dashboard.sources import modex
@@ -18,3 +20,20 @@ class ModexSourceTest(TestCase):
         assert models.Source.objects.get(name="MODEX")
         assert models.Result.objects.get(name=scenario.id, source__name="MODEX")
         assert len(models.ScalarData.objects.all()) > 0
+
+
+class JSONStreamingTest(SimpleTestCase):
+    def test_array_items_are_parsed_from_chunks(self):
+        rows = [{"process": f"pp_{i}", "value": i, "groups": ["a, b]"]} for i in range(100)]
+        text = json.dumps({"oed_scenario": [], "oed_scalars": rows, "other": [1, 2]})
+        for size in (1, 7, 1000):
+            chunks = (text[i : i + size] for i in range(0, len(text), size))
+            assert list(modex.iter_json_array(chunks, "oed_scalars")) == rows
+
+    def test_missing_array_raises_error(self):
+        with self.assertRaises(ValueError):
+            list(modex.iter_json_array(['{"oed_scenario": []}'], "oed_scalars"))
+
+    def test_truncated_array_raises_error(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(modex.iter_json_array(['{"oed_scalars": [{"value": 1}, {"val'], "oed_scalars"))
@@ -0,0 +1,185 @@
+from urllib.parse import urlencode
+
+import pandas as pd
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+
+from django_comparison_dashboard import models, preprocessing
+from django_comparison_dashboard.forms import DataFilterSet
+
+
+class LabelTest(SimpleTestCase):
+    def test_labels_are_applied_to_string_columns_only(self):
+        df = pd.DataFrame(
+            {
+                "process": ["pp_coal", "pp_gas", "pp_coal"],
+                "year": [2020, 2030, 2040],
+                "value": [1.0, 2.0, 3.0],
+                "category": [None, "2020", "pp_gas"],
+            }
+        )
+        labelled = preprocessing.apply_labels_in_df(df, {"pp_coal": "Coal", "pp_gas": "Gas", "2020": "Today"})
+        assert labelled["process"].tolist() == ["Coal", "Gas", "Coal"]
+        assert labelled["year"].tolist() == [2020, 2030, 2040]
+        assert labelled["value"].tolist() == [1.0, 2.0, 3.0]
+        assert labelled["category"].tolist() == [None, "Today", "Gas"]
+
+    def test_labels_are_applied_to_categorical_columns(self):
+        df = pd.DataFrame({"process": pd.Categorical(["pp_coal", "pp_gas", "pp_lignite"])})
+        labelled = preprocessing.apply_labels_in_df(df, {"pp_coal": "Fossil", "pp_lignite": "Fossil"})
+        assert labelled["process"].tolist() == ["Fossil", "pp_gas", "Fossil"]
+        labelled = preprocessing.apply_labels_in_df(labelled, {"pp_gas": "Gas"})
+        assert isinstance(labelled["process"].dtype, pd.CategoricalDtype)
+        assert labelled["process"].tolist() == ["Fossil", "Gas", "Fossil"]
+
+    def test_labels_are_not_chained(self):
+        df = pd.DataFrame({"process": ["a", "b"]})
+        labelled = preprocessing.apply_labels_in_df(df, {"a": "b", "b": "c"})
+        assert labelled["process"].tolist() == ["b", "c"]
+
+
+class NormalizationTest(SimpleTestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "scenario": ["base", "base", "high", "high"],
+                "year": [2020, 2030, 2020, 2030],
+                "unit": ["GWh"] * 4,
+                "value": [1.0, 3.0, 2.0, 6.0],
+            }
+        )
+
+    def test_shares_are_calculated_per_unit(self):
+        df = preprocessing.normalize_df(self.df, [])
+        assert df["value"].tolist() == [1 / 12 * 100, 3 / 12 * 100, 2 / 12 * 100, 6 / 12 * 100]
+        assert (df["unit"] == "%").all()
+
+    def test_shares_are_calculated_per_group(self):
+        df = preprocessing.normalize_df(self.df, ["scenario"])
+        assert df["value"].tolist() == [25, 75, 25, 75]
+
+    def test_values_are_related_to_reference_scenario(self):
+        df = preprocessing.compare_to_reference_scenario(self.df, "base")
+        assert df["value"].tolist() == [100, 100, 200, 200]
+        assert (df["unit"] == "%").all()
+
+    def test_difference_to_reference_scenario(self):
+        df = preprocessing.compare_to_reference_scenario(self.df, "base", "difference")
+        assert df["value"].tolist() == [0, 0, 1, 3]
+        assert (df["unit"] == "GWh").all()
+
+    def test_relative_difference_to_reference_scenario(self):
+        self.df.loc[0, "value"] = 0
+        df = preprocessing.compare_to_reference_scenario(self.df, "base", "relative_difference")
+        assert df["value"].isna().tolist() == [True, False, True, False]
+        assert df["value"].tolist()[3] == 100
+
+    def test_missing_reference_values_are_nan(self):
+        df = preprocessing.compare_to_reference_scenario(self.df.iloc[1:].copy(), "base")
+        assert df["value"].isna().tolist() == [False, True, False]
+
+
+def get_filter_data(**kwargs) -> QueryDict:
+    """Return request data for DataFilterSet using default units"""
+    data = {
+        "energy": "GWh",
+        "power": "GW",
+        "power_per_hour": "MW/h",
+        "costs": "MEUR",
+        "mass": "Gt",
+        "mass_per_year": "Gt/a",
+        "labels-TOTAL_FORMS": 0,
+        "labels-INITIAL_FORMS": 0,
+    } | kwargs
+    return QueryDict(urlencode(data, doseq=True))
+
+
+class ScalarDataTest(TestCase):
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.result = models.Result.objects.create(name="Test", source=source)
+        defaults = {"result": self.result, "scenario": "base", "parameter": "flow", "new": False, "unit": "MWh"}
+        defaults |= {"input_groups": [], "output_groups": []}
+        models.ScalarData.objects.bulk_create(
+            [
+                models.ScalarData(
+                    process="pp_coal", year=2020, sector="pow", value=1000, groups=["fossil"], **defaults
+                ),
+                models.ScalarData(
+                    process="pp_gas", year=2020, sector="pow", value=2000, groups=["fossil", "gas"], **defaults
+                ),
+                models.ScalarData(process="pp_wind", year=2030, sector="pow", value=4000, groups=[], **defaults),
+                models.ScalarData(process="chp", year=2030, sector="ind", value=8000, groups=["chp"], **defaults),
+            ]
+        )
+
+    def test_array_columns_are_joined(self):
+        filter_set = DataFilterSet([self.result.id], "bar", get_filter_data())
+        assert filter_set.is_valid()
+        df = preprocessing.get_scalar_data(filter_set)
+        assert df["groups"].tolist() == ["fossil", "fossil/gas", "", "chp"]
+        assert df["value"].tolist() == [1, 2, 4, 8]
+        assert (df["unit"] == "GWh").all()
+
+    def test_grouping_by_array_column(self):
+        filter_set = DataFilterSet(
+            [self.result.id], "bar", get_filter_data(group_by=["groups", "year"], order_by=["year", "groups"])
+        )
+        assert filter_set.is_valid()
+        df = preprocessing.get_scalar_data(filter_set)
+        assert df.columns.tolist() == ["groups", "year", "unit", "value"]
+        assert df["groups"].tolist() == ["fossil", "fossil/gas", "", "chp"]
+        assert df["value"].tolist() == [1, 2, 4, 8]
+
+    def test_normalization_and_reference_scenario_are_exclusive(self):
+        filter_set = DataFilterSet([self.result.id], "bar", get_filter_data(normalize="on", reference_scenario="base"))
+        assert not filter_set.is_valid()
+
+    def test_normalize_data(self):
+        filter_set = DataFilterSet(
+            [self.result.id],
+            "bar",
+            get_filter_data(group_by=["year"], order_by=["year"], normalize="on", normalize_by=["year"]),
+        )
+        assert filter_set.is_valid()
+        df = preprocessing.get_scalar_data(filter_set)
+        assert df["value"].tolist() == [100, 100]
+        assert (df["unit"] == "%").all()
+
+    def test_difference_to_reference_scenario(self):
+        models.ScalarData.objects.filter(process="chp").update(scenario="high", sector="pow")
+        filter_set = DataFilterSet(
+            [self.result.id],
+            "bar",
+            get_filter_data(
+                group_by=["scenario", "sector"],
+                order_by=["scenario", "sector"],
+                reference_scenario="base",
+                comparison_mode="difference",
+            ),
+        )
+        assert filter_set.is_valid(), {name: form.errors for name, form in filter_set.get_forms().items()}
+        df = preprocessing.get_scalar_data(filter_set)
+        assert df["scenario"].tolist() == ["base", "high"]
+        assert df["value"].tolist() == [0, 1]
+
+    def test_labelled_reference_scenario(self):
+        models.ScalarData.objects.filter(process="chp").update(scenario="high", sector="pow")
+        filter_set = DataFilterSet(
+            [self.result.id],
+            "bar",
+            get_filter_data(
+                group_by=["scenario", "sector"],
+                order_by=["scenario", "sector"],
+                reference_scenario="base",
+                comparison_mode="difference",
+                **{"labels-TOTAL_FORMS": 1, "labels-0-label_key": "base", "labels-0-label_value": "Reference"},
+            ),
+        )
+        assert filter_set.is_valid()
+        df = preprocessing.get_scalar_data(filter_set)
+        assert df["scenario"].tolist() == ["Reference", "high"]
+        assert df["value"].tolist() == [0, 1]
+        # Downloads are processed the same way
+        chunks = list(preprocessing.iter_scalar_data(filter_set, ["scenario", "value"]))
+        assert chunks[0]["value"].tolist() == [0, 1]
@@ -0,0 +1,26 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from django_comparison_dashboard import profiling
+
+
+@profiling.profile
+def profiled_view(request):
+    with profiling.stage("fetch") as fetch_stage:
+        fetch_stage.rows = 42
+    return HttpResponse("OK")
+
+
+class ProfilingTest(SimpleTestCase):
+    def test_profiling_is_inactive_by_default(self):
+        response = profiled_view(RequestFactory().get("/"))
+        assert "Server-Timing" not in response
+
+    @override_settings(DASHBOARD_PROFILING=True)
+    def test_server_timing_header(self):
+        with self.assertLogs("django_comparison_dashboard.profiling", level="INFO") as logs:
+            response = profiled_view(RequestFactory().get("/"))
+        timings = response["Server-Timing"].split(", ")
+        assert [timing.split(";")[0] for timing in timings] == ["fetch", "total"]
+        assert timings[0].endswith('desc="queries=0 rows=42"')
+        assert [stage["name"] for stage in logs.records[0].stages] == ["fetch", "total"]
@@ -0,0 +1,69 @@
+import json
+import os
+from unittest import mock
+from urllib.parse import urlencode
+
+import pandas as pd
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+
+from django_comparison_dashboard import graphs, rendering
+
+GRAPH_DATA = {
+    "x": "year",
+    "y": "value",
+    "color": "sector",
+    "hover_name": "process",
+    "orientation": "v",
+    "barmode": "relative",
+    "facet_col_wrap": 1,
+    "colors-TOTAL_FORMS": 1,
+    "colors-INITIAL_FORMS": 0,
+    "colors-0-color_key": "pow",
+    "colors-0-color_value": "#ff0000",
+}
+
+
+class RenderingTest(SimpleTestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "process": ["pp_coal", "pp_wind", "chp"],
+                "sector": ["pow", "pow", "heat"],
+                "year": [2020, 2030, 2030],
+                "unit": ["MWh", "MWh", "MWh"],
+                "value": [1.5, 2.0, 3.0],
+            }
+        )
+
+    def get_filter_set(self):
+        filter_set = graphs.BarGraphFilterSet(QueryDict(urlencode(GRAPH_DATA)))
+        assert filter_set.is_valid()
+        return filter_set
+
+    def test_frames_are_encoded_compactly(self):
+        payload = rendering.encode_frame(self.data)
+        decoded = rendering.decode_frame(payload)
+        pd.testing.assert_frame_equal(decoded, self.data)
+
+    @override_settings(DASHBOARD_RENDER_PROCESSES=1)
+    def test_figure_is_rendered_in_render_process(self):
+        try:
+            figure = rendering.render_figure("bar", self.data, self.get_filter_set())
+        finally:
+            rendering.shutdown_pool()
+        local_figure = graphs.bar_plot(self.data, self.get_filter_set())
+        assert figure["data"] == json.loads(local_figure.to_json())["data"]
+        assert figure["data"][0]["marker"]["color"] == "#ff0000"
+        assert "plotly" in rendering.figure_to_html(figure)
+
+    def test_jobs_are_interrupted_after_timeout(self):
+        with self.assertRaises(rendering.RenderingError), rendering._time_limit(0.01):
+            while True:
+                pass
+
+    def test_render_process_uses_settings_module_of_server(self):
+        with mock.patch.dict(os.environ, clear=True), mock.patch("django.setup") as setup:
+            rendering._init_render_process("project.settings", None)
+            assert os.environ["DJANGO_SETTINGS_MODULE"] == "project.settings"
+        setup.assert_called_once()
@@ -0,0 +1,62 @@
+from urllib.parse import urlencode
+
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from test_helpers import create_scalar_data
+
+from django_comparison_dashboard import models, preprocessing, rollups
+from django_comparison_dashboard.forms import DataFilterSet
+
+FILTER_DATA = {
+    "energy": "GWh",
+    "power": "GW",
+    "power_per_hour": "MW/h",
+    "costs": "MEUR",
+    "mass": "Gt",
+    "mass_per_year": "Gt/a",
+    "labels-TOTAL_FORMS": 0,
+    "labels-INITIAL_FORMS": 0,
+}
+
+
+@override_settings(DASHBOARD_ROLLUP_DIMENSIONS=[["year", "sector", "scenario"], ["year", "scenario"]])
+class RollupTest(TestCase):
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.results = [models.Result.objects.create(name=f"Test {i}", source=source) for i in range(2)]
+        for result in self.results:
+            create_scalar_data(result, rows=24)
+            rollups.build_rollups(result)
+
+    def get_filter_set(self, **kwargs) -> DataFilterSet:
+        data = QueryDict(urlencode(FILTER_DATA | kwargs, doseq=True))
+        filter_set = DataFilterSet([result.id for result in self.results], "bar", data)
+        assert filter_set.is_valid()
+        return filter_set
+
+    def test_rollups_are_built(self):
+        assert models.Rollup.objects.filter(result=self.results[0], dimensions="scenario,year").get().row_count == 3
+        assert models.Rollup.objects.get(result=self.results[0], dimensions="scenario,sector,year").row_count == 12
+
+    def test_smallest_matching_rollup_is_used(self):
+        queryset = rollups.get_rollup_queryset(self.get_filter_set(group_by=["year"]))
+        assert set(queryset.values_list("rollup__dimensions", flat=True)) == {"scenario,year"}
+        queryset = rollups.get_rollup_queryset(self.get_filter_set(group_by=["year"], sector=["sector_1"]))
+        assert set(queryset.values_list("rollup__dimensions", flat=True)) == {"scenario,sector,year"}
+
+    def test_no_rollup_for_uncovered_dimensions(self):
+        assert rollups.get_rollup_queryset(self.get_filter_set()) is None
+        assert rollups.get_rollup_queryset(self.get_filter_set(group_by=["process"])) is None
+        assert rollups.get_rollup_queryset(self.get_filter_set(group_by=["year"], process=["process_1"])) is None
+        models.Rollup.objects.filter(result=self.results[1]).delete()
+        assert rollups.get_rollup_queryset(self.get_filter_set(group_by=["year"])) is None
+
+    def test_rollup_data_equals_scalar_data(self):
+        for kwargs in ({"group_by": ["year"]}, {"group_by": ["sector", "year"], "sector": ["sector_1", "sector_2"]}):
+            filter_set = self.get_filter_set(order_by=["year"], **kwargs)
+            from_rollup = preprocessing.get_scalar_data(filter_set)
+            with self.settings(DASHBOARD_ROLLUP_DIMENSIONS=[]):
+                from_scalars = preprocessing.get_scalar_data(filter_set)
+            assert from_rollup.sort_values(kwargs["group_by"]).to_dict(orient="records") == from_scalars.sort_values(
+                kwargs["group_by"]
+            ).to_dict(orient="records")
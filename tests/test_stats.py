@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from django_comparison_dashboard import models, stats
+
+
+class StatisticsTest(TestCase):
+    def setUp(self):
+        source = models.Source.objects.create(name="Test")
+        self.result = models.Result.objects.create(name="Test", source=source)
+        defaults = {"result": self.result, "scenario": "base", "parameter": "flow", "new": False, "sector": "pow"}
+        defaults |= {"input_groups": [], "output_groups": []}
+        models.ScalarData.objects.bulk_create(
+            [
+                models.ScalarData(process="pp_coal", year=2020, value=-1, unit="MWh", groups=["fossil"], **defaults),
+                models.ScalarData(process="pp_gas", year=2030, value=2, unit="MWh", groups=["fossil"], **defaults),
+                models.ScalarData(process="pp_gas", year=2045, value=4, unit="MW", groups=[], **defaults),
+            ]
+        )
+
+    def test_statistics_are_built(self):
+        statistics = stats.build_statistics(self.result)
+        assert (statistics.year_min, statistics.year_max) == (2020, 2045)
+        assert (statistics.value_min, statistics.value_max) == (-1, 4)
+        assert statistics.units == ["MW", "MWh"]
+        assert statistics.distinct_counts["process"] == 2
+        assert statistics.distinct_counts["groups"] == 2
+        assert statistics.distinct_counts["scenario"] == 1
+
+    def test_statistics_are_rebuilt(self):
+        stats.build_statistics(self.result)
+        models.ScalarData.objects.filter(year=2045).delete()
+        stats.build_statistics(self.result)
+        assert models.ResultStatistics.objects.get(result=self.result).year_max == 2030
@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase, TestCase
+
+from django_comparison_dashboard import models, preprocessing, settings, timeseries
+from django_comparison_dashboard.sources.csv import CSVScenario
+
+
+class SeriesEncodingTest(SimpleTestCase):
+    def test_series_are_decoded_into_arrays(self):
+        column = pd.Series([timeseries.encode_series([1, 2, 3]), timeseries.encode_series([4.5])])
+        decoded = timeseries.decode_series_column(column)
+        assert decoded[0].tolist() == [1, 2, 3]
+        assert decoded[1].tolist() == [4.5]
+        assert decoded[0].dtype == np.float64
+
+    def test_resolution_is_parsed(self):
+        assert timeseries.parse_resolution("15min") == pd.Timedelta(minutes=15)
+        assert timeseries.parse_resolution("h") == pd.Timedelta(hours=1)
+
+
+class SeriesPreprocessingTest(SimpleTestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "process": ["a", "b", "a"],
+                "unit": ["MWh", "MWh", "MWh"],
+                "series": [np.array([1.0, 2.0]), np.array([3.0, 4.0]), np.array([5.0, 6.0])],
+            }
+        )
+
+    def test_series_are_aggregated(self):
+        df = preprocessing.aggregate_df(self.df, ["process"])
+        assert df["process"].tolist() == ["a", "b"]
+        assert [series.tolist() for series in df["series"]] == [[6, 8], [3, 4]]
+
+    def test_series_units_are_converted(self):
+        df = preprocessing.convert_units_in_df(self.df, ["GWh"])
+        assert (df["unit"] == "GWh").all()
+        assert df["series"][0].tolist() == [0.001, 0.002]
+
+
+class ResamplingTest(SimpleTestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "process": ["a", "b"],
+                "timeindex_start": [pd.Timestamp("2030-01-01", tz="UTC")] * 2,
+                "timeindex_resolution": [pd.Timedelta(hours=1)] * 2,
+                "length": [72, 72],
+                "series": [np.arange(72, dtype=float), np.ones(72)],
+            }
+        )
+
+    def test_series_are_resampled(self):
+        df = timeseries.window_and_resample(self.df, period="day", method="max")
+        assert df["series"][0].tolist() == [23, 47, 71]
+        assert df["series"][1].tolist() == [1, 1, 1]
+        assert df["timeindex"][0][1] == pd.Timestamp("2030-01-02", tz="UTC")
+        assert "timeindex_start" not in df
+
+    def test_series_are_windowed(self):
+        df = timeseries.window_and_resample(
+            self.df, start=pd.Timestamp("2030-01-02", tz="UTC"), end=pd.Timestamp("2030-01-02 23:00", tz="UTC")
+        )
+        assert df["series"][0].tolist() == list(range(24, 48))
+
+    def test_windowed_series_are_resampled(self):
+        df = timeseries.window_and_resample(
+            self.df, start=pd.Timestamp("2030-01-02 12:00", tz="UTC"), period="day", method="mean"
+        )
+        assert df["series"][1].tolist() == [1, 1]
+        assert df["series"][0].tolist() == [np.mean(range(36, 48)), np.mean(range(48, 72))]
+
+    def test_series_are_converted_into_long_format(self):
+        df = timeseries.window_and_resample(self.df, period="day")
+        df = timeseries.series_to_long_df(df)
+        assert len(df) == 6
+        assert df["process"].tolist() == ["a", "a", "a", "b", "b", "b"]
+        assert df["value"].tolist()[3:] == [24, 24, 24]
+
+
+class TimeseriesImportTest(TestCase):
+    def test_timeseries_are_stored_compressed(self):
+        data = pd.DataFrame(
+            [
+                {
+                    "scenario": "base",
+                    "process": "pp_wind",
+                    "parameter": "flow",
+                    "year": 2030,
+                    "sector": "pow",
+                    "category": None,
+                    "specification": None,
+                    "new": False,
+                    "unit": "MWh",
+                    "groups": "[]",
+                    "input_groups": "[]",
+                    "output_groups": "[]",
+                    "timeindex_start": "2030-01-01 00:00:00",
+                    "timeindex_stop": "2030-01-01 02:00:00",
+                    "timeindex_resolution": "1h",
+                    "series": "[1.0, 2.0, 3.0]",
+                }
+            ]
+        )
+        scenario = CSVScenario("ts", settings.DataType.Timeseries, SimpleNamespace(name="ts.csv"))
+        scenario._store_in_db(data)
+
+        stored = models.TimeseriesData.objects.get()
+        assert stored.length == 3
+        assert stored.timeindex_resolution == pd.Timedelta(hours=1)
+        df = preprocessing.get_timeseries_data(models.TimeseriesData.objects.all())
+        assert df["series"][0].tolist() == [1, 2, 3]
+
+    def test_series_outside_of_window_are_not_loaded(self):
+        data = {"scenario": "base", "parameter": "flow", "year": 2030, "sector": "pow", "new": False, "unit": "MWh"}
+        models.TimeseriesData.objects.create(
+            result=models.Result.objects.create(name="Test", source=models.Source.objects.create(name="Test")),
+            process="pp_wind",
+            timeindex_start=pd.Timestamp("2030-01-01", tz="UTC"),
+            timeindex_resolution=pd.Timedelta(hours=1),
+            length=48,
+            series=timeseries.encode_series(np.ones(48)),
+            **data,
+        )
+        queryset = models.TimeseriesData.objects.all()
+        df = preprocessing.get_timeseries_data(queryset, start=pd.Timestamp("2030-01-02 23:00", tz="UTC"))
+        assert df["series"][0].tolist() == [1]
+        df = preprocessing.get_timeseries_data(queryset, start=pd.Timestamp("2030-01-03", tz="UTC"))
+        assert df.empty